@@ -1,108 +1,278 @@
 # battleship_mini.py
 import random
+from array import array
+from functools import lru_cache
 
 BOARD_SIZE = 5
 SHIP_SIZES = [2, 2, 2]  # Three ships, each size 2
 MAX_TURNS = 10
 
-def create_board():
-    return [["~"] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+WATER, SHIP, HIT, MISS = "~", "S", "X", "O"
+UNKNOWN, MISSED, STRUCK = range(3)  # shot state of a cell
+
+class Board:
+    # Cell (row, col) is index row * size + col. ship_at maps each cell
+    # straight to its ship id (-1 for water) and shot holds each cell's
+    # shot state, so firing is O(1) on any board size. Occupied cells are
+    # also kept as a bitmask for placement checks.
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
+        self.ship_at = array("i", [-1]) * (size * size)
+        self.shot = bytearray(size * size)
+        self.ship_cells = []
+        self.ship_left = array("i")
+        self.occupied = 0
+        self.hits = 0
+        self.misses = 0
+        self.ships_sunk = 0
+        self.cells_left = 0
+
+    def is_free(self, mask):
+        return not self.occupied & mask
+
+    def add_ship(self, cells):
+        mask = 0
+        for cell in cells:
+            mask |= 1 << cell
+        if not self.is_free(mask):
+            raise ValueError("ships overlap")
+        ship_id = len(self.ship_cells)
+        for cell in cells:
+            self.ship_at[cell] = ship_id
+        self.ship_cells.append(list(cells))
+        self.ship_left.append(len(cells))
+        self.occupied |= mask
+        self.cells_left += len(cells)
+        return ship_id
+
+    def fire(self, row, col):
+        # Returns "repeat", "miss", "hit" or "sunk".
+        cell = row * self.size + col
+        if self.shot[cell]:
+            return "repeat"
+        ship = self.ship_at[cell]
+        if ship < 0:
+            self.shot[cell] = MISSED
+            self.misses += 1
+            return "miss"
+        self.shot[cell] = STRUCK
+        self.hits += 1
+        self.cells_left -= 1
+        self.ship_left[ship] -= 1
+        if self.ship_left[ship] == 0:
+            self.ships_sunk += 1
+            return "sunk"
+        return "hit"
+
+    @property
+    def ships_remaining(self):
+        return len(self.ship_cells) - self.ships_sunk
+
+    def symbol(self, cell, hide_ships=False):
+        if self.shot[cell]:
+            return HIT if self.shot[cell] == STRUCK else MISS
+        if self.ship_at[cell] >= 0 and not hide_ships:
+            return SHIP
+        return WATER
+
+def create_board(size=BOARD_SIZE):
+    return Board(size)
 
 def print_board(board, hide_ships=False):
-    print("  " + " ".join(str(i) for i in range(BOARD_SIZE)))
-    for idx, row in enumerate(board):
-        display_row = []
-        for cell in row:
-            if hide_ships and cell == "S":
-                display_row.append("~")
-            else:
-                display_row.append(cell)
-        print(f"{idx} " + " ".join(display_row))
-
-def place_ships(board):
-    ships = []
-    for size in SHIP_SIZES:
-        placed = False
-        while not placed:
-            orientation = random.choice(["H", "V"])
-            if orientation == "H":
-                row = random.randint(0, BOARD_SIZE - 1)
-                col = random.randint(0, BOARD_SIZE - size)
-                if all(board[row][col+i] == "~" for i in range(size)):
-                    for i in range(size):
-                        board[row][col+i] = "S"
-                    ships.append({"positions": [(row, col+i) for i in range(size)], "hits": 0})
-                    placed = True
-            else:  # Vertical
-                row = random.randint(0, BOARD_SIZE - size)
-                col = random.randint(0, BOARD_SIZE - 1)
-                if all(board[row+i][col] == "~" for i in range(size)):
-                    for i in range(size):
-                        board[row+i][col] = "S"
-                    ships.append({"positions": [(row+i, col) for i in range(size)], "hits": 0})
-                    placed = True
-    return ships
-
-def check_sunk(ship):
-    return ship["hits"] == len(ship["positions"])
-
-def play_game():
-    print("🚢 Welcome to Mini Battleship!")
-    hidden_board = create_board()
-    guess_board = create_board()
-    ships = place_ships(hidden_board)
-    hits_needed = sum(SHIP_SIZES)
+    size = board.size
+    width = len(str(size - 1))
+    print(" " * (width + 1) + " ".join(str(i % 10) for i in range(size)))
+    for row in range(size):
+        display_row = [board.symbol(row * size + col, hide_ships) for col in range(size)]
+        print(f"{row:>{width}} " + " ".join(display_row))
 
-    turns = 0
-    hits = 0
-    ships_remaining = len(ships)
+@lru_cache(maxsize=None)
+def placements(board_size, ship_size):
+    # Every in-bounds placement of one ship as (bitmask, cells).
+    result = []
+    for row in range(board_size):
+        for col in range(board_size - ship_size + 1):
+            cells = tuple(row * board_size + col + i for i in range(ship_size))
+            result.append((sum(1 << cell for cell in cells), cells))
+    if ship_size > 1:
+        for row in range(board_size - ship_size + 1):
+            for col in range(board_size):
+                cells = tuple((row + i) * board_size + col for i in range(ship_size))
+                result.append((sum(1 << cell for cell in cells), cells))
+    return result
 
-    while turns < MAX_TURNS:
-        print(f"\nTurn {turns + 1} of {MAX_TURNS}")
-        print_board(guess_board)
+RANDOM_TRIES = 16
+RANDOM_RESTARTS = 20
+PACK_BUDGET = 200_000  # search steps before a dense fleet is given up on
 
-        try:
-            row = int(input(f"Guess Row (0-{BOARD_SIZE-1}): "))
-            col = int(input(f"Guess Col (0-{BOARD_SIZE-1}): "))
-        except ValueError:
-            print("❌ Please enter numbers only.")
+class _PackBudget(Exception):
+    pass
+
+def _sample(board_size, sizes, occupied, rng):
+    # Random placement of each ship in turn among the placements that are
+    # still free. Returns None if some ship has nowhere left to go.
+    layout = []
+    for size in sizes:
+        options = placements(board_size, size)
+        # A few random draws from the precomputed list usually land on a
+        # free placement without building the full list of free ones.
+        for _ in range(RANDOM_TRIES):
+            mask, cells = rng.choice(options)
+            if not mask & occupied:
+                break
+        else:
+            free = [option for option in options if not option[0] & occupied]
+            if not free:
+                return None
+            mask, cells = rng.choice(free)
+        occupied |= mask
+        layout.append(cells)
+    return layout
+
+def _pack(board_size, counts, occupied, holes, rng, failed, budget):
+    # Exhaustive search for dense fleets. The lowest free cell is either
+    # left empty (while holes remain) or is the first cell of some ship.
+    # counts is a tuple of (ship size, ships left); dead ends are memoized.
+    # budget is a one-item list of steps left; _PackBudget when it runs out.
+    if not any(count for _, count in counts):
+        return []
+    key = (occupied, counts)
+    if key in failed:
+        return None
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise _PackBudget
+    free = ~occupied & ((1 << board_size * board_size) - 1)
+    if not free:
+        return None  # ships left but no cells
+    bit = free & -free
+    cell = bit.bit_length() - 1
+    row, col = divmod(cell, board_size)
+    options = []
+    for i, (size, count) in enumerate(counts):
+        if not count:
+            continue
+        shapes = []
+        if col + size <= board_size:
+            shapes.append(tuple(range(cell, cell + size)))
+        if size > 1 and row + size <= board_size:
+            shapes.append(tuple(range(cell, cell + size * board_size, board_size)))
+        for cells in shapes:
+            mask = sum(1 << c for c in cells)
+            if not mask & occupied:
+                options.append((i, cells, mask))
+    if holes:
+        options.append(None)
+    if rng is not None:
+        rng.shuffle(options)
+    for option in options:
+        if option is None:
+            rest = _pack(board_size, counts, occupied | bit, holes - 1, rng, failed, budget)
+            if rest is not None:
+                return rest
             continue
+        i, cells, mask = option
+        size, count = counts[i]
+        rest = _pack(board_size, counts[:i] + ((size, count - 1),) + counts[i + 1:],
+                     occupied | mask, holes, rng, failed, budget)
+        if rest is not None:
+            return [cells] + rest
+    failed.add(key)
+    return None
+
+def _layout(board_size, sizes, occupied, rng):
+    # Cells for each ship in `sizes` (same order), or None if impossible.
+    holes = board_size * board_size - bin(occupied).count("1") - sum(sizes)
+    if holes < 0:
+        return None  # more ship cells than free cells
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i])  # largest first
+    for _ in range(RANDOM_RESTARTS):
+        layout = _sample(board_size, [sizes[i] for i in order], occupied, rng)
+        if layout is not None:
+            break
+    else:
+        counts = tuple((size, sizes.count(size)) for size in sorted(set(sizes), reverse=True))
+        try:
+            packed = _pack(board_size, counts, occupied, holes, rng, set(), [PACK_BUDGET])
+        except _PackBudget:
+            raise ValueError(f"fleet fits by area but no layout was found in {PACK_BUDGET:,} "
+                             "search steps; use fewer or smaller ships") from None
+        if packed is None:
+            return None
+        # Packed ships come back in board order; hand them out by size.
+        by_size = {}
+        for cells in packed:
+            by_size.setdefault(len(cells), []).append(cells)
+        return [by_size[size].pop() for size in sizes]
+    ship_cells = [None] * len(sizes)
+    for i, cells in zip(order, layout):
+        ship_cells[i] = cells
+    return ship_cells
+
+@lru_cache(maxsize=128)
+def check_fleet(board_size, sizes):
+    # Raises ValueError if the fleet cannot be placed on an empty board.
+    if any(not 1 <= size <= board_size for size in sizes):
+        raise ValueError("every ship must fit on the board")
+    if sum(sizes) > board_size * board_size:
+        raise ValueError("fleet has more cells than the board")
+    if _layout(board_size, list(sizes), 0, random.Random(0)) is None:
+        raise ValueError("fleet cannot be arranged without overlapping")
+
+def place_ships(board, sizes=SHIP_SIZES, rng=random):
+    check_fleet(board.size, tuple(sizes))
+    layout = _layout(board.size, list(sizes), board.occupied, rng)
+    if layout is None:
+        raise ValueError("fleet does not fit around the ships already placed")
+    for cells in layout:
+        board.add_ship(cells)
+    return board.ship_cells
+
+def play_game(shooter=None):
+    # With a shooter (choose() and observe() methods) the computer guesses.
+    print("🚢 Welcome to Mini Battleship!")
+    board = create_board()
+    place_ships(board)
+
+    while board.misses < MAX_TURNS:  # Only misses cost turns
+        print(f"\nTurn {board.misses + 1} of {MAX_TURNS}")
+        print_board(board, hide_ships=True)
+
+        if shooter is not None:
+            row, col = shooter.choose()
+            print(f"🤖 Computer fires at row {row}, col {col}")
+        else:
+            try:
+                row = int(input(f"Guess Row (0-{BOARD_SIZE-1}): "))
+                col = int(input(f"Guess Col (0-{BOARD_SIZE-1}): "))
+            except ValueError:
+                print("❌ Please enter numbers only.")
+                continue
 
         if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
             print("❌ Out of bounds. Try again.")
             continue
 
-        if guess_board[row][col] != "~":
+        result = board.fire(row, col)
+        if shooter is not None:
+            sunk_cells = board.ship_cells[board.ship_at[row * BOARD_SIZE + col]] if result == "sunk" else ()
+            shooter.observe(row, col, result, sunk_cells)
+        if result == "repeat":
             print("⚠️ You already guessed that spot.")
-            continue
-
-        # Check hit
-        hit_ship = None
-        for ship in ships:
-            if (row, col) in ship["positions"]:
-                hit_ship = ship
-                break
-
-        if hit_ship:
+        elif result == "miss":
+            print("🌊 Miss!")
+        else:
             print("🎯 Hit! (Free shot, no turn lost)")
-            guess_board[row][col] = "X"
-            hits += 1
-            hit_ship["hits"] += 1
-            if check_sunk(hit_ship):
-                ships_remaining -= 1
-                print(f"💥 You sunk a ship! 🚢 Ships left: {ships_remaining}")
-                if ships_remaining == 0:
+            if result == "sunk":
+                print(f"💥 You sunk a ship! 🚢 Ships left: {board.ships_remaining}")
+                if board.ships_remaining == 0:
                     print("\n🏆 You sank all the ships! You win!")
                     return  # End game immediately
-        else:
-            print("🌊 Miss!")
-            guess_board[row][col] = "O"
-            turns += 1  # Only misses cost turns
 
     # Game over (ran out of turns)
     print("\n💀 Out of turns. You lose.")
     print("The enemy ships were at:")
-    print_board(hidden_board)
+    print_board(board)
 
 def main():
     while True:
@@ -0,0 +1,130 @@
+# battleship_ai.py
+import argparse
+import time
+
+import numpy as np
+
+import battleship
+from battleship import BOARD_SIZE, SHIP_SIZES, placements
+
+TARGET_WEIGHT = 20.0  # extra weight per known hit a placement would explain
+
+class DensityShooter:
+    # Fires at the cell covered by the most placements that are still
+    # possible for the ships still afloat. Placements through a hit that is
+    # not yet part of a sunk ship count TARGET_WEIGHT times more per hit.
+    # Per ship size the heatmap is kept up to date one shot at a time: a
+    # miss or a sunk ship removes the placements through those cells and a
+    # hit re-weights the placements through it.
+    def __init__(self, board_size=BOARD_SIZE, sizes=SHIP_SIZES):
+        self.board_size = board_size
+        num_cells = board_size * board_size
+        self.sizes = sorted(set(sizes))
+        self.afloat = np.array([list(sizes).count(s) for s in self.sizes], dtype=float)
+        self.shot = np.zeros(num_cells, dtype=bool)
+        self.weights = TARGET_WEIGHT ** np.arange(max(self.sizes) + 1)
+        self.heat = np.zeros((len(self.sizes), num_cells))
+        self.cells = []
+        self.alive = []
+        self.hits = []
+        self.by_cell = []
+        for k, size in enumerate(self.sizes):
+            cells = np.array([c for _, c in placements(board_size, size)], dtype=np.intp)
+            # by_cell[k][c] lists the placements of this size through cell c.
+            owners = np.repeat(np.arange(len(cells)), size)
+            order = np.argsort(cells.ravel(), kind="stable")
+            bounds = np.searchsorted(cells.ravel()[order], np.arange(num_cells + 1))
+            self.by_cell.append([owners[order[bounds[c]:bounds[c + 1]]] for c in range(num_cells)])
+            self.cells.append(cells)
+            self.alive.append(np.ones(len(cells), dtype=bool))
+            self.hits.append(np.zeros(len(cells), dtype=np.intp))
+            self.heat[k] = np.bincount(cells.ravel(), minlength=num_cells)
+
+    def _through(self, k, cell):
+        ids = self.by_cell[k][cell]
+        return ids[self.alive[k][ids]]
+
+    def _block(self, cell):
+        # Nothing still afloat can be here.
+        for k, cells in enumerate(self.cells):
+            ids = self._through(k, cell)
+            if ids.size:
+                weight = self.weights[self.hits[k][ids]]
+                np.subtract.at(self.heat[k], cells[ids].ravel(), np.repeat(weight, cells.shape[1]))
+                self.alive[k][ids] = False
+
+    def _hit(self, cell):
+        for k, cells in enumerate(self.cells):
+            ids = self._through(k, cell)
+            if ids.size:
+                hits = self.hits[k][ids]
+                gain = self.weights[hits + 1] - self.weights[hits]
+                np.add.at(self.heat[k], cells[ids].ravel(), np.repeat(gain, cells.shape[1]))
+                self.hits[k][ids] = hits + 1
+
+    def observe(self, row, col, result, sunk_cells=()):
+        # result is what Board.fire returned; a sunk ship also reveals its cells.
+        cell = row * self.board_size + col
+        self.shot[cell] = True
+        if result == "miss":
+            self._block(cell)
+        elif result in ("hit", "sunk"):
+            self._hit(cell)
+        if result == "sunk":
+            self.afloat[self.sizes.index(len(sunk_cells))] -= 1
+            for c in sunk_cells:
+                self._block(c)
+
+    def heatmap(self):
+        scores = self.afloat @ self.heat
+        scores[self.shot] = -1.0
+        return scores
+
+    def choose(self):
+        scores = self.heatmap()
+        cell = int(scores.argmax())
+        if scores[cell] <= 0:
+            # No consistent placement left; any open cell will do.
+            cell = int(np.flatnonzero(~self.shot)[0])
+        return divmod(cell, self.board_size)
+
+def fire(board, shooter):
+    # One shot chosen by the shooter against a battleship.Board.
+    row, col = shooter.choose()
+    result = board.fire(row, col)
+    sunk_cells = ()
+    if result == "sunk":
+        sunk_cells = board.ship_cells[board.ship_at[row * board.size + col]]
+    shooter.observe(row, col, result, sunk_cells)
+    return row, col, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Probability-density Battleship shooter")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--ships", type=int, nargs="+", default=SHIP_SIZES, help="ship lengths")
+    parser.add_argument("--play", action="store_true",
+                        help="let the shooter play the regular game with its turn limit")
+    args = parser.parse_args()
+
+    if args.play:
+        battleship.play_game(DensityShooter())
+        return
+
+    board = battleship.create_board(args.size)
+    battleship.place_ships(board, args.ships)
+    shooter = DensityShooter(args.size, args.ships)
+    shots = 0
+    thinking = 0.0
+    while board.ships_remaining:
+        start = time.perf_counter()
+        row, col, result = fire(board, shooter)
+        thinking += time.perf_counter() - start
+        shots += 1
+        if args.size <= 20:
+            print(f"Computer fires at ({row}, {col}): {result}")
+    battleship.print_board(board)
+    print(f"\n🏆 All ships sunk in {shots} shots ({board.misses} misses), "
+          f"{thinking / shots * 1000:.3f} ms per shot")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# battleship_bench.py
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from battleship import BOARD_SIZE, MAX_TURNS, SHIP_SIZES, create_board, place_ships
+from battleship_ai import DensityShooter, fire
+
+class RandomShooter:
+    # Fires at unshot cells in random order.
+    def __init__(self, board_size, sizes, rng):
+        self.board_size = board_size
+        self.order = list(range(board_size * board_size))
+        rng.shuffle(self.order)
+
+    def choose(self):
+        return divmod(self.order.pop(), self.board_size)
+
+    def observe(self, row, col, result, sunk_cells=()):
+        pass
+
+class HuntTargetShooter(RandomShooter):
+    # Random shots until a hit, then the hit's neighbours first.
+    def __init__(self, board_size, sizes, rng):
+        super().__init__(board_size, sizes, rng)
+        self.shot = set()
+        self.targets = []
+
+    def choose(self):
+        while self.targets:
+            cell = self.targets.pop()
+            if cell not in self.shot:
+                return divmod(cell, self.board_size)
+        while True:
+            cell = self.order.pop()
+            if cell not in self.shot:
+                return divmod(cell, self.board_size)
+
+    def observe(self, row, col, result, sunk_cells=()):
+        self.shot.add(row * self.board_size + col)
+        if result in ("hit", "sunk"):
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                r, c = row + dr, col + dc
+                if 0 <= r < self.board_size and 0 <= c < self.board_size:
+                    self.targets.append(r * self.board_size + c)
+
+def density_shooter(board_size, sizes, rng):
+    return DensityShooter(board_size, sizes)
+
+# Shooter factories take (board_size, sizes, rng); any picklable callable works.
+SHOOTERS = {
+    "random": RandomShooter,
+    "hunt": HuntTargetShooter,
+    "density": density_shooter,
+}
+
+def _play(shooter, board):
+    # Fire until every ship is sunk; returns (shots, misses).
+    shots = 0
+    while board.ships_remaining:
+        fire(board, shooter)
+        shots += 1
+    return shots, board.misses
+
+def _run_games(seed, games, make_shooter, board_size, sizes, max_misses):
+    # Worker: only the shots histogram and the win count leave the process.
+    rng = random.Random(seed)
+    shots_hist = np.zeros(board_size * board_size + 1, dtype=np.int64)
+    wins = 0
+    for _ in range(games):
+        board = create_board(board_size)
+        place_ships(board, sizes, rng)
+        shots, misses = _play(make_shooter(board_size, sizes, rng), board)
+        shots_hist[shots] += 1
+        wins += misses < max_misses
+    return shots_hist, wins
+
+def benchmark(games, shooter="density", board_size=BOARD_SIZE, sizes=SHIP_SIZES,
+              max_misses=MAX_TURNS, workers=None, seed=None, games_per_task=2_000):
+    make_shooter = SHOOTERS.get(shooter, shooter)
+    sizes = list(sizes)
+    counts = [min(games_per_task, games - i) for i in range(0, games, games_per_task)]
+    # One independent stream per task, so a seed reproduces the run
+    # whatever the number of workers.
+    seeds = [int(s.generate_state(1, np.uint64)[0]) for s in np.random.SeedSequence(seed).spawn(len(counts))]
+    args = [(s, n, make_shooter, board_size, sizes, max_misses) for s, n in zip(seeds, counts)]
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    if workers == 1:
+        shards = [_run_games(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(_run_games, *zip(*args)))
+    elapsed = time.perf_counter() - start
+
+    hist = sum(h for h, _ in shards)
+    wins = sum(w for _, w in shards)
+    cumulative = np.cumsum(hist) / games
+    shots = np.arange(len(hist))
+    return {
+        "games": games,
+        "shots_histogram": hist,
+        "mean_shots": float((shots * hist).sum() / games),
+        "median_shots": int(np.searchsorted(cumulative, 0.5)),
+        "p90_shots": int(np.searchsorted(cumulative, 0.9)),
+        "max_shots": int(shots[hist > 0].max()),
+        "win_rate": wins / games,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else float("inf"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Battleship shooter benchmark")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--shooter", choices=sorted(SHOOTERS), default="density")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--ships", type=int, nargs="+", default=SHIP_SIZES, help="ship lengths")
+    parser.add_argument("--max-misses", type=int, default=MAX_TURNS)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    stats = benchmark(args.games, args.shooter, args.size, args.ships,
+                      args.max_misses, args.workers, args.seed)
+    print(f"{args.shooter} shooter, {stats['games']:,} games on {args.size}x{args.size}")
+    print(f"Shots to win: mean {stats['mean_shots']:.2f}, median {stats['median_shots']}, "
+          f"p90 {stats['p90_shots']}, max {stats['max_shots']}")
+    print(f"Win rate with {args.max_misses} misses allowed: {stats['win_rate']:.1%}")
+    print(f"Speed: {stats['games_per_second']:,.0f} games/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# battleship_layouts.py
+import argparse
+import random
+import time
+
+import numpy as np
+
+from battleship import BOARD_SIZE, SHIP_SIZES, Board, check_fleet, place_ships, placements
+
+CHUNK_CELLS = 20_000_000  # board cells held per chunk of layouts
+RANDOM_TRIES = 16
+MAX_ROUNDS = 8  # vectorized retries before the leftovers go to place_ships
+
+def placement_cells(board_size, ship_size):
+    # (P, ship_size) cell indices of every in-bounds placement.
+    return np.array([cells for _, cells in placements(board_size, ship_size)], dtype=np.intp)
+
+def _fill(rng, ship_ids, sizes, cells_by_size):
+    # Place every ship on all rows of ship_ids at once, each ship choosing
+    # uniformly among the placements still free on its own board.
+    # Returns a mask of rows where some ship ran out of room.
+    count, _ = ship_ids.shape
+    occupied = ship_ids >= 0
+    failed = np.zeros(count, dtype=bool)
+    rows = np.arange(count)
+    for ship, size in sorted(enumerate(sizes), key=lambda item: -item[1]):
+        cells = cells_by_size[size]
+        # Take the first free one of a few uniform draws; that is still a
+        # uniform pick among the free placements.
+        picks = rng.integers(len(cells), size=(count, RANDOM_TRIES))
+        free = ~occupied[rows[:, None, None], cells[picks]].any(axis=2)
+        choice = picks[rows, free.argmax(axis=1)]
+        # Rows where every draw was taken check all placements instead.
+        slow = np.flatnonzero(~free.any(axis=1))
+        if slow.size:
+            free = ~occupied[slow[:, None, None], cells].any(axis=2)
+            keys = rng.random(free.shape)
+            keys[~free] = 2.0
+            choice[slow] = keys.argmin(axis=1)
+            failed[slow] |= ~free.any(axis=1)
+        chosen = cells[choice]
+        occupied[rows[:, None], chosen] = True
+        ship_ids[rows[:, None], chosen] = ship
+    return failed
+
+def generate_layouts(count, board_size=BOARD_SIZE, sizes=SHIP_SIZES, seed=None):
+    # (count, board_size ** 2) array of ship ids per cell, -1 for water.
+    # Ship i always has length sizes[i].
+    sizes = list(sizes)
+    check_fleet(board_size, tuple(sizes))
+    rng = np.random.default_rng(seed)
+    cells_by_size = {size: placement_cells(board_size, size) for size in set(sizes)}
+    chunk = max(1, CHUNK_CELLS // (board_size * board_size * RANDOM_TRIES))
+    dtype = np.int8 if len(sizes) < 128 else np.int16
+
+    layouts = np.full((count, board_size * board_size), -1, dtype=dtype)
+    for start in range(0, count, chunk):
+        pending = np.arange(start, min(count, start + chunk))
+        for _ in range(MAX_ROUNDS):
+            if not pending.size:
+                break
+            ship_ids = np.full((pending.size, board_size * board_size), -1, dtype=dtype)
+            failed = _fill(rng, ship_ids, sizes, cells_by_size)
+            done = ~failed
+            layouts[pending[done]] = ship_ids[done]
+            # Boards where a ship was boxed out are dealt again.
+            pending = pending[failed]
+        # Dense fleets rarely fit greedily; place_ships can backtrack.
+        fallback = random.Random(int(rng.integers(2 ** 63)))
+        for row in pending:
+            board = Board(board_size)
+            for ship, cells in enumerate(place_ships(board, sizes, fallback)):
+                layouts[row, list(cells)] = ship
+    return layouts
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk random Battleship fleet layouts")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--ships", type=int, nargs="+", default=SHIP_SIZES, help="ship lengths")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", help="save the layouts to this .npy file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    layouts = generate_layouts(args.count, args.size, args.ships, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {len(layouts):,} layouts in {elapsed:.2f}s ({len(layouts) / elapsed:,.0f} layouts/s)")
+    if args.out:
+        np.save(args.out, layouts)
+        print(f"Saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
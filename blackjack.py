@@ -1,42 +1,173 @@
 # blackjack_betting.py
 import random
+import queue
 import sys
+import threading
+from array import array
 
 SUITS = ["♠", "♥", "♦", "♣"]
 RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
 VALUES = {**{str(n): n for n in range(2, 11)}, **{"J": 10, "Q": 10, "K": 10, "A": 11}}
 
-def new_deck(num_decks=1):
-    deck = [(r, s) for r in RANKS for s in SUITS] * num_decks
-    random.shuffle(deck)
+# Cards are small ints (rank index * 4 + suit index); strings are only for display.
+RANK_VALUE = array("b", [VALUES[r] for r in RANKS])
+CARD_VALUE = array("b", [RANK_VALUE[c // len(SUITS)] for c in range(len(RANKS) * len(SUITS))])
+CARD_NAMES = [f"{r}{s}" for r in RANKS for s in SUITS]
+
+def card_rank(card):
+    return card // len(SUITS)
+
+def new_deck(num_decks=1, rng=random):
+    deck = array("B", range(len(CARD_NAMES))) * num_decks
+    rng.shuffle(deck)
     return deck
 
+class ShufflePool:
+    # Keeps a few shuffled shoes ready, refilled by a background thread,
+    # so a reshuffle is a queue get instead of an inline shuffle. With
+    # block=False an empty pool shuffles inline rather than wait, for
+    # callers such as an event loop that must never block.
+    def __init__(self, num_decks=4, size=2, seed=None, block=True):
+        self.num_decks = num_decks
+        self.block = block
+        self.rng = random.Random(seed)
+        self.inline_rng = random.Random(self.rng.random())
+        self.shoes = queue.Queue(maxsize=size)
+        self.thread = threading.Thread(target=self._fill, daemon=True)
+        self.thread.start()
+
+    def _fill(self):
+        while True:
+            self.shoes.put(new_deck(self.num_decks, self.rng))
+
+    def get(self):
+        if self.block:
+            return self.shoes.get()
+        try:
+            return self.shoes.get_nowait()
+        except queue.Empty:
+            return new_deck(self.num_decks, self.inline_rng)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def shuffle_pool(num_decks):
+    # One shared pool per shoe size for every table in the process.
+    with _pools_lock:
+        if num_decks not in _pools:
+            _pools[num_decks] = ShufflePool(num_decks)
+        return _pools[num_decks]
+
+class Shoe:
+    def __init__(self, num_decks=4, penetration=0.75, pool=None):
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be in (0, 1]")
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.cut_card = int(len(CARD_NAMES) * num_decks * penetration)
+        self.pool = pool or shuffle_pool(num_decks)
+        self.cards = self.pool.get()
+        self.dealt = 0
+        self.shuffles = 1
+
+    def draw(self):
+        # Running out mid-round only happens at 100% penetration.
+        if self.dealt >= len(self.cards):
+            self.reshuffle()
+        card = self.cards[self.dealt]
+        self.dealt += 1
+        return card
+
+    def remaining(self):
+        return len(self.cards) - self.dealt
+
+    @property
+    def needs_shuffle(self):
+        return self.dealt >= self.cut_card
+
+    def reshuffle(self):
+        self.cards = self.pool.get()
+        self.dealt = 0
+        self.shuffles += 1
+
+class Hand:
+    __slots__ = ("cards", "total", "soft")
+
+    def __init__(self, cards=()):
+        self.cards = array("B")
+        self.total = 0
+        self.soft = 0  # aces still counted as 11
+        for card in cards:
+            self.add(card)
+
+    def add(self, card):
+        self.cards.append(card)
+        value = CARD_VALUE[card]
+        self.total += value
+        if value == 11:
+            self.soft += 1
+        while self.total > 21 and self.soft:
+            self.total -= 10
+            self.soft -= 1
+
+    def copy(self):
+        hand = Hand()
+        hand.cards = array("B", self.cards)
+        hand.total = self.total
+        hand.soft = self.soft
+        return hand
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __str__(self):
+        return " ".join(CARD_NAMES[c] for c in self.cards)
+
 def hand_value(hand):
-    total = sum(VALUES[r] for r, _ in hand)
-    aces = sum(1 for r, _ in hand if r == "A")
-    while total > 21 and aces:
-        total -= 10
-        aces -= 1
-    return total
+    if not isinstance(hand, Hand):
+        hand = Hand(hand)
+    return hand.total
 
 def show_hand(name, hand, hide_first=False):
     if hide_first:
-        print(f"{name}: [??] " + " ".join(f"{r}{s}" for r, s in hand[1:]))
+        print(f"{name}: [??] " + " ".join(CARD_NAMES[c] for c in hand.cards[1:]))
     else:
-        print(f"{name}: " + " ".join(f"{r}{s}" for r, s in hand) + f"  (total: {hand_value(hand)})")
+        print(f"{name}: {hand}  (total: {hand.total})")
 
 def is_blackjack(hand):
     return len(hand) == 2 and hand_value(hand) == 21
 
-def play_hand(deck, player_hand, dealer, balance, bet):
+def dealer_hits(dealer):
+    # The dealer draws to 17 and stands on all 17s.
+    return dealer.total < 17
+
+def settle_hand(player_hand, dealer):
+    # 1 if the player wins, -1 if the dealer wins, 0 for a push.
+    p_total = player_hand.total
+    d_total = dealer.total
+    if p_total > 21:
+        return -1
+    if d_total > 21 or p_total > d_total:
+        return 1
+    if p_total < d_total:
+        return -1
+    return 0
+
+def play_hand(shoe, player_hand, dealer, balance, bet):
     # Player’s turn
     doubled = False
     while True:
         move = input("Hit, Stand, or Double? [h/s/d] ").strip().lower()
         if move in ("h", "hit"):
-            player_hand.append(deck.pop())
+            player_hand.add(shoe.draw())
             show_hand("You", player_hand)
-            if hand_value(player_hand) > 21:
+            if player_hand.total > 21:
                 print("Bust! You lose this hand.")
                 return balance - bet
         elif move in ("s", "stand"):
@@ -44,9 +175,9 @@ def play_hand(deck, player_hand, dealer, balance, bet):
         elif move in ("d", "double") and len(player_hand) == 2 and balance >= bet * 2:
             bet *= 2
             doubled = True
-            player_hand.append(deck.pop())
+            player_hand.add(shoe.draw())
             show_hand("You", player_hand)
-            if hand_value(player_hand) > 21:
+            if player_hand.total > 21:
                 print("Bust after doubling! You lose this hand.")
                 return balance - bet
             break
@@ -56,24 +187,22 @@ def play_hand(deck, player_hand, dealer, balance, bet):
     # Dealer’s turn
     print("\nDealer's turn:")
     show_hand("Dealer", dealer)
-    while hand_value(dealer) < 17:
-        dealer.append(deck.pop())
+    while dealer_hits(dealer):
+        dealer.add(shoe.draw())
         show_hand("Dealer", dealer)
 
-    p_total = hand_value(player_hand)
-    d_total = hand_value(dealer)
-
-    if d_total > 21 or p_total > d_total:
+    outcome = settle_hand(player_hand, dealer)
+    if outcome > 0:
         print("You win this hand!")
         return balance + bet
-    elif p_total < d_total:
+    elif outcome < 0:
         print("Dealer wins this hand.")
         return balance - bet
     else:
         print("Push (tie).")
         return balance
 
-def play_round(deck, balance):
+def play_round(shoe, balance):
     if balance <= 0:
         print("You’re out of money! Game over.")
         sys.exit()
@@ -89,8 +218,8 @@ def play_round(deck, balance):
         except ValueError:
             print("Enter a number.")
 
-    player = [deck.pop(), deck.pop()]
-    dealer = [deck.pop(), deck.pop()]
+    player = Hand([shoe.draw(), shoe.draw()])
+    dealer = Hand([shoe.draw(), shoe.draw()])
 
     print("\n=== New Round ===")
     show_hand("Dealer", dealer, hide_first=True)
@@ -110,29 +239,32 @@ def play_round(deck, balance):
             return balance - bet
 
     # Splits
-    if player[0][0] == player[1][0]:
+    if card_rank(player[0]) == card_rank(player[1]):
         split = input("You have a pair! Do you want to split? [y/n] ").strip().lower()
         if split == "y" and balance >= bet * 2:
-            hand1 = [player[0], deck.pop()]
-            hand2 = [player[1], deck.pop()]
+            hand1 = Hand([player[0], shoe.draw()])
+            hand2 = Hand([player[1], shoe.draw()])
             print("\nPlaying first split hand:")
             show_hand("You", hand1)
-            balance = play_hand(deck, hand1, dealer.copy(), balance, bet)
+            balance = play_hand(shoe, hand1, dealer.copy(), balance, bet)
             print("\nPlaying second split hand:")
             show_hand("You", hand2)
-            balance = play_hand(deck, hand2, dealer.copy(), balance, bet)
+            balance = play_hand(shoe, hand2, dealer.copy(), balance, bet)
             return balance
 
     # Normal play
-    return play_hand(deck, player, dealer, balance, bet)
+    return play_hand(shoe, player, dealer, balance, bet)
 
 def main():
     print("Welcome to Blackjack with Betting, Double Down, and Splits!")
-    deck = new_deck(4)
+    shoe = Shoe(4)
     balance = 500  # starting money
 
     while True:
-        balance = play_round(deck, balance)
+        if shoe.needs_shuffle:
+            print("\nCut card reached. Shuffling a fresh shoe.")
+            shoe.reshuffle()
+        balance = play_round(shoe, balance)
         print(f"\nYour balance: ${balance}")
         again = input("Play again? [y/n] ").strip().lower()
         if again not in ("y", "yes"):
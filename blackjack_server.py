@@ -0,0 +1,329 @@
+# blackjack_server.py
+import argparse
+import asyncio
+import json
+import time
+
+from blackjack import (
+    Hand, Shoe, ShufflePool, card_rank, dealer_hits, is_blackjack, settle_hand,
+)
+
+STARTING_BALANCE = 500
+
+class Table:
+    # One player's blackjack table, driven by messages instead of input().
+    # States: "betting" -> "playing" -> back to "betting", or "broke".
+    def __init__(self, table_id, shoe, balance=STARTING_BALANCE):
+        self.id = table_id
+        self.shoe = shoe
+        self.balance = balance
+        self.state = "betting"
+        self.hands = []
+        self.bets = []
+        self.current = 0
+        self.dealer = None
+        self.last_result = 0
+        self.opened = time.perf_counter()
+        self.messages = 0
+        self.rounds = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def handle(self, message):
+        op = message.get("op")
+        if not isinstance(op, str):
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        handler = {
+            "bet": self.bet,
+            "hit": self.hit,
+            "stand": self.stand,
+            "double": self.double,
+            "split": self.split,
+            "state": self.view,
+            "stats": self.stats,
+        }.get(op)
+        if handler is None:
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        try:
+            return handler(message)
+        except ValueError as e:
+            return {**self.view(), "ok": False, "error": str(e)}
+
+    def record(self, seconds):
+        self.messages += 1
+        self.latency_total += seconds
+        self.latency_max = max(self.latency_max, seconds)
+
+    def _require(self, state):
+        if self.state != state:
+            raise ValueError(f"not allowed while {self.state}")
+
+    def bet(self, message):
+        self._require("betting")
+        amount = message.get("amount", 0)
+        # JSON true would pass as 1, and int() would truncate 2.5 or
+        # overflow on 1e999 (infinity); only whole numbers are bets.
+        if isinstance(amount, float) and amount.is_integer():
+            amount = int(amount)
+        elif isinstance(amount, str):
+            try:
+                amount = int(amount)
+            except ValueError:
+                pass
+        if isinstance(amount, bool) or not isinstance(amount, int):
+            raise ValueError("bet must be a whole number")
+        if not 1 <= amount <= self.balance:
+            raise ValueError("invalid bet amount")
+        if self.shoe.needs_shuffle:
+            self.shoe.reshuffle()
+
+        player = Hand([self.shoe.draw(), self.shoe.draw()])
+        self.dealer = Hand([self.shoe.draw(), self.shoe.draw()])
+        self.hands = [player]
+        self.bets = [amount]
+        self.current = 0
+        self.state = "playing"
+
+        if is_blackjack(player) or is_blackjack(self.dealer):
+            if is_blackjack(player) and is_blackjack(self.dealer):
+                result = 0
+            elif is_blackjack(player):
+                result = int(1.5 * amount)
+            else:
+                result = -amount
+            self._finish(result)
+        return self.view()
+
+    def hit(self, message):
+        self._require("playing")
+        hand = self.hands[self.current]
+        hand.add(self.shoe.draw())
+        if hand.total > 21:
+            self._next_hand()
+        return self.view()
+
+    def stand(self, message):
+        self._require("playing")
+        self._next_hand()
+        return self.view()
+
+    def double(self, message):
+        self._require("playing")
+        hand = self.hands[self.current]
+        bet = self.bets[self.current]
+        if len(hand) != 2 or self.balance < bet * 2:
+            raise ValueError("cannot double")
+        self.bets[self.current] = bet * 2
+        hand.add(self.shoe.draw())
+        self._next_hand()
+        return self.view()
+
+    def split(self, message):
+        self._require("playing")
+        hand = self.hands[0]
+        bet = self.bets[0]
+        if (len(self.hands) != 1 or len(hand) != 2
+                or card_rank(hand[0]) != card_rank(hand[1]) or self.balance < bet * 2):
+            raise ValueError("cannot split")
+        self.hands = [Hand([hand[0], self.shoe.draw()]), Hand([hand[1], self.shoe.draw()])]
+        self.bets = [bet, bet]
+        return self.view()
+
+    def _next_hand(self):
+        self.current += 1
+        if self.current < len(self.hands):
+            return
+        # Dealer's turn, only if some hand is still standing.
+        if any(hand.total <= 21 for hand in self.hands):
+            while dealer_hits(self.dealer):
+                self.dealer.add(self.shoe.draw())
+        result = sum(settle_hand(hand, self.dealer) * bet for hand, bet in zip(self.hands, self.bets))
+        self._finish(result)
+
+    def _finish(self, result):
+        self.balance += result
+        self.last_result = result
+        self.rounds += 1
+        self.state = "betting" if self.balance > 0 else "broke"
+
+    def view(self, message=None):
+        view = {"ok": True, "table": self.id, "state": self.state, "balance": self.balance}
+        if self.dealer is None:
+            return view
+        view["hands"] = [{"cards": str(hand), "total": hand.total, "bet": bet}
+                         for hand, bet in zip(self.hands, self.bets)]
+        if self.state == "playing":
+            view["current"] = self.current
+            view["dealer"] = "[??] " + str(Hand(self.dealer.cards[1:]))
+        else:
+            view["dealer"] = str(self.dealer)
+            view["dealer_total"] = self.dealer.total
+            view["result"] = self.last_result
+        return view
+
+    def stats(self, message=None):
+        elapsed = time.perf_counter() - self.opened
+        return {
+            "ok": True,
+            "table": self.id,
+            "messages": self.messages,
+            "rounds": self.rounds,
+            "mean_latency_us": self.latency_total / self.messages * 1e6 if self.messages else 0.0,
+            "max_latency_us": self.latency_max * 1e6,
+            "messages_per_second": self.messages / elapsed if elapsed else 0.0,
+            "rounds_per_second": self.rounds / elapsed if elapsed else 0.0,
+        }
+
+class BlackjackServer:
+    # Every connection gets its own table; all of them share one event loop
+    # and one pool of pre-shuffled shoes, which shuffles inline when empty
+    # rather than block the loop.
+    def __init__(self, num_decks=4, pool_size=256):
+        self.num_decks = num_decks
+        self.pool = ShufflePool(num_decks, size=pool_size, block=False)
+        self.tables = {}
+        self.next_id = 1
+        self.started = time.perf_counter()
+        self.closed_messages = 0
+        self.closed_rounds = 0
+
+    async def handle_client(self, reader, writer):
+        table = Table(self.next_id, Shoe(self.num_decks, pool=self.pool))
+        self.tables[table.id] = table
+        self.next_id += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Longer than the stream limit; the rest of it cannot
+                    # be told apart from the next message, so hang up.
+                    writer.write(b'{"ok": false, "error": "message too long"}\n')
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                start = time.perf_counter()
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    message = None
+                if not isinstance(message, dict):
+                    message = {}
+                if message.get("op") == "quit":
+                    break
+                if message.get("op") == "server_stats":
+                    reply = self.stats()
+                else:
+                    reply = table.handle(message)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+                table.record(time.perf_counter() - start)
+        except ConnectionError:
+            pass
+        finally:
+            del self.tables[table.id]
+            self.closed_messages += table.messages
+            self.closed_rounds += table.rounds
+            writer.close()
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started
+        messages = self.closed_messages + sum(t.messages for t in self.tables.values())
+        rounds = self.closed_rounds + sum(t.rounds for t in self.tables.values())
+        return {
+            "ok": True,
+            "open_tables": len(self.tables),
+            "messages": messages,
+            "rounds": rounds,
+            "messages_per_second": messages / elapsed if elapsed else 0.0,
+            "rounds_per_second": rounds / elapsed if elapsed else 0.0,
+        }
+
+async def serve(host="127.0.0.1", port=8765, unix_path=None, num_decks=4):
+    server = BlackjackServer(num_decks)
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle_client, path=unix_path, backlog=4096)
+    else:
+        listener = await asyncio.start_server(server.handle_client, host, port, backlog=4096)
+    print(f"Blackjack server listening on {unix_path or f'{host}:{port}'}")
+    async with listener:
+        await listener.serve_forever()
+
+async def _open(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+async def _session(host, port, unix_path, rounds, bet, latencies):
+    # A simple bot: bet, then hit below 17, split nothing, double nothing.
+    reader, writer = await _open(host, port, unix_path)
+
+    async def request(message):
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        return reply
+
+    for _ in range(rounds):
+        reply = await request({"op": "bet", "amount": bet})
+        if not reply["ok"]:
+            break
+        while reply["state"] == "playing":
+            hand = reply["hands"][reply["current"]]
+            reply = await request({"op": "hit" if hand["total"] < 17 else "stand"})
+    stats = await request({"op": "stats"})
+    writer.write(b'{"op": "quit"}\n')
+    await writer.drain()
+    writer.close()
+    return stats
+
+async def load_test(host="127.0.0.1", port=8765, unix_path=None, clients=200, rounds=50, bet=5):
+    latencies = []
+    start = time.perf_counter()
+    tables = await asyncio.gather(*(
+        _session(host, port, unix_path, rounds, bet, latencies) for _ in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "clients": clients,
+        "messages": len(latencies),
+        "rounds": sum(t["rounds"] for t in tables),
+        "seconds": elapsed,
+        "messages_per_second": len(latencies) / elapsed,
+        "p50_latency_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_latency_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "server_mean_latency_us": sum(t["mean_latency_us"] for t in tables) / len(tables),
+        "server_max_latency_us": max(t["max_latency_us"] for t in tables),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-table blackjack server")
+    parser.add_argument("mode", choices=["serve", "load"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on / connect to a Unix socket path instead")
+    parser.add_argument("--decks", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.unix, args.decks))
+        except KeyboardInterrupt:
+            print("\nServer stopped.")
+        return
+
+    stats = asyncio.run(load_test(args.host, args.port, args.unix, args.clients, args.rounds))
+    print(f"Clients: {stats['clients']}, rounds: {stats['rounds']:,}, messages: {stats['messages']:,}")
+    print(f"Throughput: {stats['messages_per_second']:,.0f} messages/s in {stats['seconds']:.2f}s")
+    print(f"Round trip: p50 {stats['p50_latency_ms']:.2f} ms, p99 {stats['p99_latency_ms']:.2f} ms")
+    print(f"Server handling: mean {stats['server_mean_latency_us']:.0f} µs, "
+          f"max {stats['server_max_latency_us']:.0f} µs")
+
+if __name__ == "__main__":
+    main()
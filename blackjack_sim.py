@@ -0,0 +1,405 @@
+# blackjack_sim.py
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from blackjack import RANK_VALUE, RANKS
+
+# Cards are rank indices into RANKS; suits never matter to the rules.
+RANK_VALUES = np.array(RANK_VALUE, dtype=np.int16)
+ROW_CARDS = 32  # cards reserved for each hand of a batch
+
+# Hi-Lo tag per rank index: 2-6 count +1, 7-9 count 0, tens and aces -1.
+HI_LO = np.array([-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1], dtype=np.int16)
+MAX_TRUE_COUNT = 10
+
+HIT, STAND, DOUBLE = range(3)
+ACTION_CODES = {"h": HIT, "s": STAND, "d": DOUBLE}
+
+def basic_strategy(total, soft, up, can_double=False, can_split=False):
+    # Multi-deck basic strategy for these rules: dealer stands on 17,
+    # double on any two cards (also after a split), one split per hand.
+    if can_split:
+        pair = 11 if soft else total // 2
+        if pair in (8, 11):
+            return "p"
+        if pair in (2, 3, 7) and up <= 7:
+            return "p"
+        if pair == 6 and up <= 6:
+            return "p"
+        if pair == 9 and up not in (7, 10, 11):
+            return "p"
+        if pair == 4 and up in (5, 6):
+            return "p"
+    if soft:
+        if total >= 19:
+            return "s"
+        if total == 18:
+            if can_double and 3 <= up <= 6:
+                return "d"
+            return "s" if up <= 8 else "h"
+        if can_double and (
+            (total == 17 and 3 <= up <= 6)
+            or (total in (15, 16) and 4 <= up <= 6)
+            or (total in (13, 14) and 5 <= up <= 6)
+        ):
+            return "d"
+        return "h"
+    if total >= 17:
+        return "s"
+    if total >= 13:
+        return "s" if up <= 6 else "h"
+    if total == 12:
+        return "s" if 4 <= up <= 6 else "h"
+    if total == 11:
+        return "d" if can_double else "h"
+    if total == 10:
+        return "d" if can_double and up <= 9 else "h"
+    if total == 9:
+        return "d" if can_double and 3 <= up <= 6 else "h"
+    return "h"
+
+def _action_code(move, can_double):
+    move = move.strip().lower()[:1]
+    if move == "d" and not can_double:
+        return HIT
+    if move not in ACTION_CODES:
+        raise ValueError(f"Strategy returned invalid move {move!r}")
+    return ACTION_CODES[move]
+
+def compile_strategy(strategy):
+    # Ask the callback once per decision state so batches only index arrays.
+    # Tables are [total, soft, dealer upcard value]; pairs are [pair value, upcard].
+    first = np.full((22, 2, 12), STAND, dtype=np.int8)
+    later = np.full((22, 2, 12), STAND, dtype=np.int8)
+    split = np.zeros((12, 12), dtype=bool)
+    for up in range(2, 12):
+        for total in range(4, 22):
+            for soft in (False, True):
+                if soft and total < 12:
+                    continue
+                first[total, int(soft), up] = _action_code(strategy(total, soft, up, True, False), True)
+                later[total, int(soft), up] = _action_code(strategy(total, soft, up, False, False), False)
+        for pair in range(2, 12):
+            total = 12 if pair == 11 else pair * 2
+            split[pair, up] = strategy(total, pair == 11, up, True, True).strip().lower()[:1] == "p"
+    return first, later, split
+
+def _add_card(total, soft, values):
+    # Same ace handling as hand_value, applied one card at a time.
+    total = total + values
+    soft = soft + (values == 11)
+    for _ in range(2):
+        over = (total > 21) & (soft > 0)
+        total = total - 10 * over
+        soft = soft - over
+    return total, soft
+
+def play_batch(cards, ptr, tables, payout=1.5, rows=None):
+    # Play one round on each of `rows` (default: all) of `cards` (rank
+    # indices), starting at ptr. ptr is advanced in place; returns each
+    # played row's result in units of the bet.
+    first, later, split = tables
+    width = cards.shape[1]
+    if rows is None:
+        rows = np.arange(len(cards))
+    n = len(rows)
+
+    def draw(idx):
+        # Rows that somehow run past their cards wrap around.
+        row = rows[idx]
+        card = RANK_VALUES[cards[row, ptr[row] % width]]
+        ptr[row] += 1
+        return card
+
+    start = ptr[rows]
+    r0 = cards[rows, start % width]
+    r1 = cards[rows, (start + 1) % width]
+    hole = RANK_VALUES[cards[rows, (start + 2) % width]]
+    up = RANK_VALUES[cards[rows, (start + 3) % width]]
+    ptr[rows] += 4
+    v0 = RANK_VALUES[r0]
+    v1 = RANK_VALUES[r1]
+
+    p_total, p_soft = _add_card(v0, (v0 == 11).astype(np.int16), v1)
+    d_total, d_soft = _add_card(hole, (hole == 11).astype(np.int16), up)
+
+    # Naturals settle immediately, just like play_round.
+    p_bj = p_total == 21
+    d_bj = d_total == 21
+    result = np.zeros(n)
+    result[p_bj & ~d_bj] = payout
+    result[d_bj & ~p_bj] = -1.0
+    active = ~(p_bj | d_bj)
+
+    total = np.zeros((n, 2), dtype=np.int16)
+    soft = np.zeros((n, 2), dtype=np.int16)
+    ncards = np.full((n, 2), 2, dtype=np.int16)
+    bet = np.ones((n, 2))
+    exists = np.zeros((n, 2), dtype=bool)
+    exists[:, 0] = active
+    total[:, 0] = p_total
+    soft[:, 0] = p_soft
+
+    is_split = active & (r0 == r1) & split[v0, up]
+    idx = np.flatnonzero(is_split)
+    if idx.size:
+        exists[idx, 1] = True
+        for slot, value in ((0, v0[idx]), (1, v1[idx])):
+            t, s = _add_card(value, (value == 11).astype(np.int16), draw(idx))
+            total[idx, slot] = t
+            soft[idx, slot] = s
+
+    # Player hands, one split hand after the other.
+    for slot in (0, 1):
+        playing = np.flatnonzero(exists[:, slot])
+        while playing.size:
+            t = total[playing, slot]
+            s = (soft[playing, slot] > 0).astype(np.intp)
+            u = up[playing]
+            action = np.where(ncards[playing, slot] == 2, first[t, s, u], later[t, s, u])
+            acting = action != STAND
+            playing = playing[acting]
+            doubled = action[acting] == DOUBLE
+            t, s = _add_card(total[playing, slot], soft[playing, slot], draw(playing))
+            total[playing, slot] = t
+            soft[playing, slot] = s
+            ncards[playing, slot] += 1
+            bet[playing[doubled], slot] *= 2
+            playing = playing[~doubled & (t <= 21)]
+
+    # Dealer draws to 17 only if some player hand is still standing.
+    alive = exists & (total <= 21)
+    drawing = np.flatnonzero(alive.any(axis=1))
+    while drawing.size:
+        drawing = drawing[d_total[drawing] < 17]
+        d_total[drawing], d_soft[drawing] = _add_card(d_total[drawing], d_soft[drawing], draw(drawing))
+
+    for slot in (0, 1):
+        p = total[:, slot]
+        won = alive[:, slot] & ((d_total > 21) | (p > d_total))
+        lost = exists[:, slot] & ((p > 21) | ((d_total <= 21) & (p < d_total)))
+        result += bet[:, slot] * (won.astype(float) - lost)
+    return result
+
+def deal_rows(rng, num_rows, num_decks=4):
+    # Shuffle whole shoes and cut each one into ROW_CARDS-sized hands.
+    shoe = np.repeat(np.arange(len(RANKS), dtype=np.int8), 4 * num_decks)
+    per_shoe = len(shoe) // ROW_CARDS
+    if per_shoe == 0:
+        raise ValueError("Shoe is too small to deal from")
+    num_shoes = -(-num_rows // per_shoe)
+    shoes = rng.permuted(np.tile(shoe, (num_shoes, 1)), axis=1)
+    return shoes[:, :per_shoe * ROW_CARDS].reshape(-1, ROW_CARDS)[:num_rows]
+
+def simulate(num_hands, strategy=basic_strategy, num_decks=4, bet=1, bankroll=500,
+             batch_size=100_000, seed=None, trajectory_points=1000, payout=1.5):
+    rng = np.random.default_rng(seed)
+    tables = compile_strategy(strategy)
+    step = max(1, num_hands // trajectory_points)
+    trajectory = [bankroll]
+    balance = float(bankroll)
+    played = 0
+    total = 0.0
+    total_sq = 0.0
+
+    start = time.perf_counter()
+    while played < num_hands:
+        n = min(batch_size, num_hands - played)
+        cards = deal_rows(rng, n, num_decks)
+        results = play_batch(cards, np.zeros(n, dtype=np.intp), tables, payout) * bet
+        running = balance + np.cumsum(results)
+        trajectory.extend(running[(-played - 1) % step::step].tolist())
+        balance = float(running[-1])
+        total += results.sum()
+        total_sq += np.square(results).sum()
+        played += n
+    elapsed = time.perf_counter() - start
+
+    ev = total / played / bet
+    variance = total_sq / played / bet ** 2 - ev ** 2
+    return {
+        "hands": played,
+        "ev": ev,
+        "variance": variance,
+        "std_error": (variance / played) ** 0.5,
+        "final_bankroll": balance,
+        "trajectory": np.array(trajectory),
+        "seconds": elapsed,
+        "hands_per_second": played / elapsed if elapsed else float("inf"),
+    }
+
+def hi_lo_spread(true_count):
+    # Bet units per true count: one unit at neutral or worse, up to eight.
+    return min(max(true_count, 1), 8)
+
+def compile_bets(bet_spread, bet):
+    counts = range(-MAX_TRUE_COUNT, MAX_TRUE_COUNT + 1)
+    return np.array([bet * bet_spread(tc) for tc in counts], dtype=float)
+
+def _play_shoes(seed, num_players, num_shoes, tables, bets, num_decks, penetration,
+                bankroll, payout):
+    # Worker: each player plays num_shoes fresh shoes round by round, all
+    # players in lockstep. Only summary arrays leave the process. A bet is
+    # never more than the player's balance, and a player whose balance
+    # reaches 0 is ruined and stops playing. A double or split on that last
+    # bet can lose more than was left; the balance still stops at 0, so a
+    # drawdown is never more than the peak.
+    rng = np.random.default_rng(seed)
+    shoe = np.repeat(np.arange(len(RANKS), dtype=np.int8), 4 * num_decks)
+    size = len(shoe)
+    # A round starts only with ROW_CARDS cards left, so none runs out of
+    # cards and wraps around the shoe, even at full penetration.
+    cut_card = min(int(size * penetration), size - ROW_CARDS + 1)
+    buckets = 2 * MAX_TRUE_COUNT + 1
+
+    units = np.zeros(buckets)
+    units_sq = np.zeros(buckets)
+    rounds = np.zeros(buckets, dtype=np.int64)
+    won = 0.0
+    wagered = 0.0
+    balance = np.full(num_players, float(bankroll))
+    peak = balance.copy()
+    drawdown = np.zeros(num_players)
+    ruined = np.zeros(num_players, dtype=bool)
+
+    for _ in range(num_shoes):
+        cards = rng.permuted(np.tile(shoe, (num_players, 1)), axis=1)
+        running = np.zeros((num_players, size + 1), dtype=np.int16)
+        np.cumsum(HI_LO[cards], axis=1, out=running[:, 1:])
+        ptr = np.zeros(num_players, dtype=np.intp)
+        rows = np.flatnonzero(~ruined)
+        while rows.size:
+            start = ptr[rows]
+            decks_left = (size - start) / (len(RANKS) * 4)
+            true_count = np.floor(running[rows, start] / decks_left).astype(np.intp)
+            bucket = np.clip(true_count, -MAX_TRUE_COUNT, MAX_TRUE_COUNT) + MAX_TRUE_COUNT
+            wager = np.minimum(bets[bucket], balance[rows])
+            result = play_batch(cards, ptr, tables, payout, rows)
+
+            units += np.bincount(bucket, weights=result, minlength=buckets)
+            units_sq += np.bincount(bucket, weights=result * result, minlength=buckets)
+            rounds += np.bincount(bucket, minlength=buckets)
+            won += (result * wager).sum()
+            wagered += wager.sum()
+
+            balance[rows] = np.maximum(balance[rows] + result * wager, 0.0)
+            np.maximum(peak, balance, out=peak)
+            np.maximum(drawdown, peak - balance, out=drawdown)
+            ruined |= balance <= 0
+            rows = rows[(ptr[rows] < cut_card) & ~ruined[rows]]
+
+    return {
+        "units": units, "units_sq": units_sq, "rounds": rounds,
+        "won": won, "wagered": wagered, "players": num_players,
+        "ruined": int(ruined.sum()), "max_drawdown": float(drawdown.max()),
+        "drawdown_sum": float(drawdown.sum()),
+    }
+
+def _merge(shards):
+    total = dict(shards[0])
+    for shard in shards[1:]:
+        for key, value in shard.items():
+            total[key] = max(total[key], value) if key == "max_drawdown" else total[key] + value
+    return total
+
+def simulate_counting(num_players, num_shoes=10, strategy=basic_strategy, bet_spread=hi_lo_spread,
+                      num_decks=4, penetration=0.75, bet=1, bankroll=500, workers=None,
+                      seed=None, players_per_task=5_000, payout=1.5):
+    # Shard players across a process pool. Each task gets its own child of
+    # one SeedSequence, so a seed reproduces the run for any worker count.
+    if not 0 < penetration <= 1:
+        raise ValueError("penetration must be in (0, 1]")
+    tables = compile_strategy(strategy)
+    bets = compile_bets(bet_spread, bet)
+    sizes = [min(players_per_task, num_players - i) for i in range(0, num_players, players_per_task)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    args = [(s, n, num_shoes, tables, bets, num_decks, penetration, bankroll, payout)
+            for s, n in zip(seeds, sizes)]
+    if workers == 1:
+        shards = [_play_shoes(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(_play_shoes, *zip(*args)))
+    elapsed = time.perf_counter() - start
+
+    stats = _merge(shards)
+    rounds = stats["rounds"]
+    seen = rounds > 0
+    ev = np.divide(stats["units"], rounds, out=np.zeros_like(stats["units"]), where=seen)
+    var = np.divide(stats["units_sq"], rounds, out=np.zeros_like(ev), where=seen) - ev ** 2
+    by_count = {
+        tc - MAX_TRUE_COUNT: {"rounds": int(rounds[tc]), "ev": ev[tc],
+                              "std_error": (var[tc] / rounds[tc]) ** 0.5}
+        for tc in np.flatnonzero(seen)
+    }
+    total_rounds = int(rounds.sum())
+    return {
+        "rounds": total_rounds,
+        "players": stats["players"],
+        "ev_per_unit": stats["won"] / stats["wagered"],
+        "ev_per_round": stats["won"] / total_rounds,
+        "ev_by_true_count": by_count,
+        "risk_of_ruin": stats["ruined"] / stats["players"],
+        "max_drawdown": stats["max_drawdown"],
+        "mean_max_drawdown": stats["drawdown_sum"] / stats["players"],
+        "seconds": elapsed,
+        "hands_per_second": total_rounds / elapsed if elapsed else float("inf"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless blackjack simulator")
+    parser.add_argument("--hands", type=int, default=1_000_000)
+    parser.add_argument("--decks", type=int, default=4)
+    parser.add_argument("--bet", type=int, default=1)
+    parser.add_argument("--bankroll", type=int, default=500)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--strategy", choices=["basic", "table"], default="basic",
+                        help="built-in chart or the precomputed EV table")
+    parser.add_argument("--count", action="store_true",
+                        help="play whole shoes with a Hi-Lo bet spread on all cores")
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--shoes", type=int, default=10, help="shoes per player")
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    strategy = basic_strategy
+    if args.strategy == "table":
+        from blackjack_strategy import load_strategy
+        strategy = load_strategy(args.decks)
+
+    if args.count:
+        stats = simulate_counting(args.players, args.shoes, strategy=strategy,
+                                  num_decks=args.decks, penetration=args.penetration,
+                                  bet=args.bet, bankroll=args.bankroll,
+                                  workers=args.workers, seed=args.seed)
+        print(f"Rounds played: {stats['rounds']:,} by {stats['players']:,} players")
+        print(f"EV per unit wagered: {stats['ev_per_unit'] * 100:+.3f}%")
+        print(f"EV per round: ${stats['ev_per_round']:+.4f}")
+        print("True count   rounds        EV")
+        for tc, row in stats["ev_by_true_count"].items():
+            print(f"{tc:>+10} {row['rounds']:>8,} {row['ev'] * 100:>+8.2f}% ± {row['std_error'] * 100:.2f}%")
+        print(f"Risk of ruin: {stats['risk_of_ruin'] * 100:.2f}%")
+        print(f"Max drawdown: ${stats['max_drawdown']:.2f} "
+              f"(mean ${stats['mean_max_drawdown']:.2f})")
+        print(f"Speed: {stats['hands_per_second']:,.0f} hands/s")
+        return
+
+    stats = simulate(args.hands, strategy=strategy, num_decks=args.decks, bet=args.bet,
+                     bankroll=args.bankroll, seed=args.seed)
+    print(f"Hands played: {stats['hands']:,}")
+    print(f"EV per hand: {stats['ev'] * 100:+.3f}% ± {stats['std_error'] * 100:.3f}%")
+    print(f"Variance per hand: {stats['variance']:.4f}")
+    print(f"Final bankroll: ${stats['final_bankroll']:.2f} "
+          f"(low ${stats['trajectory'].min():.2f}, high ${stats['trajectory'].max():.2f})")
+    print(f"Speed: {stats['hands_per_second']:,.0f} hands/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# blackjack_strategy.py
+import argparse
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from blackjack import RANKS, VALUES
+
+# A shoe composition is a tuple of card counts for the values 2..11 (ace = 11).
+CARD_VALUES = range(2, 12)
+OUTCOMES = ["17", "18", "19", "20", "21", "bust"]
+DEALER_CACHE_SIZE = 500_000
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HIT, STAND, DOUBLE = range(3)
+MOVES = "hsd"
+
+def full_shoe(num_decks=4):
+    counts = [0] * len(CARD_VALUES)
+    for r in RANKS:
+        counts[VALUES[r] - 2] += 4 * num_decks
+    return tuple(counts)
+
+def remove_cards(shoe, *values):
+    counts = list(shoe)
+    for v in values:
+        counts[v - 2] -= 1
+    return tuple(counts)
+
+def _add(total, soft, value):
+    # Incremental form of hand_value: soft counts aces still worth 11.
+    total += value
+    soft += value == 11
+    while total > 21 and soft:
+        total -= 10
+        soft -= 1
+    return total, soft
+
+def _final(total):
+    probs = [0.0] * len(OUTCOMES)
+    probs[5 if total > 21 else total - 17] = 1.0
+    return probs
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def _dealer_outcomes(total, soft, shoe):
+    # Probability of each final dealer total, drawing without replacement
+    # until the total reaches 17 (the dealer stands on soft 17).
+    if total >= 17:
+        return tuple(_final(total))
+    remaining = sum(shoe)
+    probs = [0.0] * len(OUTCOMES)
+    for i, count in enumerate(shoe):
+        if not count:
+            continue
+        t, s = _add(total, soft, i + 2)
+        sub = _dealer_outcomes(t, s, shoe[:i] + (count - 1,) + shoe[i + 1:])
+        weight = count / remaining
+        for k, p in enumerate(sub):
+            probs[k] += weight * p
+    return tuple(probs)
+
+def dealer_distribution(up, shoe):
+    # Final totals for a dealer showing `up`, given the dealer has no
+    # blackjack (naturals are settled before the player acts).
+    # `shoe` is the composition left after the upcard was dealt.
+    probs = [0.0] * len(OUTCOMES)
+    excluded = {11: 10, 10: 11}.get(up)
+    remaining = sum(c for i, c in enumerate(shoe) if i + 2 != excluded)
+    for i, count in enumerate(shoe):
+        if not count or i + 2 == excluded:
+            continue
+        t, s = _add(up, up == 11, i + 2)
+        sub = _dealer_outcomes(t, s, shoe[:i] + (count - 1,) + shoe[i + 1:])
+        for k, p in enumerate(sub):
+            probs[k] += count / remaining * p
+    return probs
+
+def dealer_table(shoe):
+    # One row of outcome probabilities per upcard value 2..11.
+    table = np.zeros((12, len(OUTCOMES)))
+    for up in CARD_VALUES:
+        if shoe[up - 2]:
+            table[up] = dealer_distribution(up, remove_cards(shoe, up))
+    return table
+
+def clear_cache():
+    _dealer_outcomes.cache_clear()
+
+def _stand_ev(total, dealer):
+    if total > 21:
+        return -1.0
+    ev = dealer[5]
+    for k, p in enumerate(dealer[:5]):
+        d = 17 + k
+        if total > d:
+            ev += p
+        elif total < d:
+            ev -= p
+    return ev
+
+def _hand_evs(dealer, card_probs):
+    # Hit/stand/double EVs for every (total, soft) state against one upcard.
+    # Player draws use the shoe's card frequencies (removal is ignored).
+    best = {}
+
+    def best_after_hit(total, soft):
+        if total > 21:
+            return -1.0
+        key = (total, soft)
+        if key not in best:
+            best[key] = max(_stand_ev(total, dealer), hit_ev(total, soft))
+        return best[key]
+
+    def hit_ev(total, soft):
+        return sum(p * best_after_hit(*_add(total, soft, v)) for v, p in card_probs)
+
+    def double_ev(total, soft):
+        return 2 * sum(p * _stand_ev(_add(total, soft, v)[0], dealer) for v, p in card_probs)
+
+    evs = np.full((22, 2, 3), -np.inf)
+    for total in range(2, 22):
+        for soft in (0, 1):
+            if soft and total < 11:
+                continue
+            evs[total, soft] = hit_ev(total, soft), _stand_ev(total, dealer), double_ev(total, soft)
+    return evs
+
+def build_tables(num_decks=4, shoe=None):
+    # ev[total, soft, up, move] for the first decision of a hand and
+    # split_ev[pair value, up] for splitting a pair once.
+    shoe = shoe or full_shoe(num_decks)
+    ev = np.full((22, 2, 12, 3), -np.inf)
+    split_ev = np.full((12, 12), -np.inf)
+    for up in CARD_VALUES:
+        if not shoe[up - 2]:
+            continue
+        rest = remove_cards(shoe, up)
+        dealer = dealer_distribution(up, rest)
+        total_cards = sum(rest)
+        card_probs = [(i + 2, c / total_cards) for i, c in enumerate(rest) if c]
+        evs = _hand_evs(dealer, card_probs)
+        ev[:, :, up] = evs
+        for pair in CARD_VALUES:
+            # Each split hand starts from a single card and may double.
+            hand = 0.0
+            for v, p in card_probs:
+                t, s = _add(pair, int(pair == 11), v)
+                hand += p * evs[t, s].max()
+            split_ev[pair, up] = 2 * hand
+    return ev.astype(np.float32), split_ev.astype(np.float32)
+
+def table_path(num_decks):
+    return os.path.join(TABLE_DIR, f"blackjack_strategy_{num_decks}d.npz")
+
+def save_tables(tables, path):
+    ev, split_ev = tables
+    np.savez_compressed(path, ev=ev, split_ev=split_ev)
+
+def load_tables(num_decks=4, path=None, rebuild=False):
+    path = path or table_path(num_decks)
+    if rebuild or not os.path.exists(path):
+        save_tables(build_tables(num_decks), path)
+    with np.load(path) as data:
+        return data["ev"], data["split_ev"]
+
+def load_strategy(num_decks=4, path=None):
+    # Turn the EV tables into a strategy callback (same signature as
+    # blackjack_sim.basic_strategy) whose lookups are plain array reads.
+    ev, split_ev = load_tables(num_decks, path)
+    first = ev.argmax(axis=-1)
+    later = ev[..., :DOUBLE].argmax(axis=-1)
+    pair_total = [0, 0] + [12 if v == 11 else 2 * v for v in range(2, 12)]
+    should_split = np.zeros((12, 12), dtype=bool)
+    for pair in CARD_VALUES:
+        soft = int(pair == 11)
+        should_split[pair] = split_ev[pair] > ev[pair_total[pair], soft].max(axis=-1)
+
+    def strategy(total, soft, up, can_double=False, can_split=False):
+        if can_split:
+            pair = 11 if soft else total // 2
+            if should_split[pair, up]:
+                return "p"
+        table = first if can_double else later
+        return MOVES[table[total, int(soft), up]]
+
+    return strategy
+
+def print_chart(tables):
+    ev, _ = tables
+    first = ev.argmax(axis=-1)
+    ups = list(CARD_VALUES)
+    print("      " + " ".join(f"{'A' if u == 11 else u:>2}" for u in ups))
+    for soft, label in ((0, "H"), (1, "S")):
+        for total in range(5 + 7 * soft, 22):
+            row = " ".join(f"{MOVES[first[total, soft, u]].upper():>2}" for u in ups)
+            print(f"{label}{total:>3}  {row}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build blackjack strategy tables")
+    parser.add_argument("--decks", type=int, default=4)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+    tables = load_tables(args.decks, rebuild=args.rebuild)
+    print(f"Strategy table: {table_path(args.decks)}")
+    print_chart(tables)
+
+if __name__ == "__main__":
+    main()
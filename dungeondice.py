@@ -2,6 +2,15 @@
 import random
 import time
 
+HERO_CLASSES = ["Warrior", "Rogue", "Mage"]
+CRIT_CHANCE = 0.1
+ROGUE_CRIT = 2.5
+SPECIAL_BONUS = {"Warrior": 3, "Rogue": 0, "Mage": 4}
+POTION_HEAL = 20
+REST_HEAL = 10
+POTION_CHANCE = 0.5
+SWORD_CHANCE = 0.3
+
 def roll_die(sides=6):
     return random.randint(1, sides)
 
@@ -16,7 +25,7 @@ class Character:
     def attack(self):
         roll = roll_die(self.attack_die)
         crit = False
-        if random.random() <= 0.1:
+        if random.random() <= CRIT_CHANCE:
             crit = True
             roll *= 2
         print(f"{self.name} rolls an attack: {roll}" + (" 🔥 Critical!" if crit else ""))
@@ -25,7 +34,7 @@ class Character:
     def defend(self):
         roll = roll_die(self.defense_die)
         crit = False
-        if random.random() <= 0.1:
+        if random.random() <= CRIT_CHANCE:
             crit = True
             roll *= 2
         print(f"{self.name} rolls a defense: {roll}" + (" 🛡️ Critical!" if crit else ""))
@@ -48,14 +57,11 @@ class Player(Character):
         self.special_used = True
         if self.hero_class == "Warrior":
             print("⚔️ Warrior Power Strike! +3 attack")
-            return 3
         elif self.hero_class == "Rogue":
             print("🗡️ Rogue Sneak Attack! +5 attack if crit")
-            return 0  # handled in attack roll
         elif self.hero_class == "Mage":
             print("🔥 Mage Fireball! +4 attack")
-            return 4
-        return 0
+        return SPECIAL_BONUS.get(self.hero_class, 0)
 
     def attack(self, use_special=False):
         roll = roll_die(self.attack_die)
@@ -63,10 +69,10 @@ class Player(Character):
             roll += self.use_special()
         # Rogue crit bonus
         crit = False
-        if random.random() <= 0.1:
+        if random.random() <= CRIT_CHANCE:
             crit = True
             if self.hero_class == "Rogue":
-                roll *= 2.5
+                roll *= ROGUE_CRIT
             else:
                 roll *= 2
         print(f"{self.name} rolls an attack: {int(roll)}" + (" 🔥 Critical!" if crit else ""))
@@ -74,7 +80,7 @@ class Player(Character):
 
     def heal(self):
         if self.inventory["Potion"] > 0:
-            heal_amount = 20
+            heal_amount = POTION_HEAL
             self.hp = min(self.max_hp, self.hp + heal_amount)
             self.inventory["Potion"] -= 1
             print(f"💖 {self.name} used a potion and healed {heal_amount} HP!")
@@ -126,10 +132,10 @@ def fight(player, monster):
             print(f"🏆 {player.name} defeated {monster.name}!")
             # Loot drop
             loot_chance = random.random()
-            if loot_chance < 0.5:
+            if loot_chance < POTION_CHANCE:
                 player.inventory["Potion"] += 1
                 print("🍾 Loot: Potion added to inventory!")
-            elif loot_chance < 0.8:
+            elif loot_chance < POTION_CHANCE + SWORD_CHANCE:
                 player.inventory["Sword"] += 1
                 player.attack_die += 1
                 print("⚔️ Loot: Sword! Attack die +1")
@@ -147,33 +153,34 @@ def fight(player, monster):
             print(f"💀 {player.name} was defeated by {monster.name}!")
             break
 
+def make_monsters():
+    return [
+        Monster("Goblin", 20),
+        Monster("Skeleton", 25),
+        Monster("Orc", 30),
+        Monster("Troll", 35),
+        Monster("Dragon Boss", 50, attack_die=8, is_boss=True)
+    ]
+
 def dungeon_run():
     print("🏰 Welcome to Dungeon Dice RPG!")
     name = input("Enter your hero's name: ")
     print("Choose a class: Warrior, Rogue, Mage")
     while True:
         hero_class = input("Class: ").capitalize()
-        if hero_class in ["Warrior", "Rogue", "Mage"]:
+        if hero_class in HERO_CLASSES:
             break
         print("❌ Invalid class!")
     player = Player(name, hero_class)
 
-    monsters = [
-        Monster("Goblin", 20),
-        Monster("Skeleton", 25),
-        Monster("Orc", 30),
-        Monster("Troll", 35),
-        Monster("Dragon Boss", 50, attack_die=8, is_boss=True)
-    ]
-
-    for monster in monsters:
+    for monster in make_monsters():
         fight(player, monster)
         if player.hp <= 0:
             print("\n💔 Your dungeon run is over!")
             break
         else:
             # Heal a bit between battles
-            heal = min(10, player.max_hp - player.hp)
+            heal = min(REST_HEAL, player.max_hp - player.hp)
             player.hp += heal
             print(f"💖 {player.name} recovers {heal} HP before next fight!")
             player.special_used = False
@@ -0,0 +1,168 @@
+# dungeondice_balance.py
+import argparse
+import itertools
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from dungeondice import CRIT_CHANCE, HERO_CLASSES, POTION_HEAL, SPECIAL_BONUS, Monster, Player, make_monsters
+from dungeondice_engine import simulate_batch
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dungeondice_balance.txt")
+
+# Everything a balance pass can change; tuples so configs can be dict keys.
+Config = namedtuple("Config", "monster_hp monster_die hero_die special crit potion_heal")
+
+def base_config():
+    monsters = make_monsters()
+    return Config(
+        monster_hp=tuple(m.hp for m in monsters),
+        monster_die=tuple(m.attack_die for m in monsters),
+        hero_die=Player("", HERO_CLASSES[0]).attack_die,
+        special=tuple(SPECIAL_BONUS[c] for c in HERO_CLASSES),
+        crit=CRIT_CHANCE,
+        potion_heal=POTION_HEAL,
+    )
+
+def format_config(config):
+    join = lambda values: "/".join(str(v) for v in values)
+    return (f"hp={join(config.monster_hp)} die={join(config.monster_die)} hero={config.hero_die} "
+            f"special={join(config.special)} crit={config.crit:.2f} heal={config.potion_heal}")
+
+def parse_config(text):
+    fields = dict(item.split("=") for item in text.split())
+    split = lambda value: tuple(int(v) for v in value.split("/"))
+    return Config(split(fields["hp"]), split(fields["die"]), int(fields["hero"]),
+                  split(fields["special"]), round(float(fields["crit"]), 2), int(fields["heal"]))
+
+def evaluate(config, runs, seed):
+    # Clear rate per hero class. Every config uses the same seeds, so
+    # differences between configs are not just dice noise.
+    monsters = [Monster(m.name, hp, die, m.defense_die, m.is_boss)
+                for m, hp, die in zip(make_monsters(), config.monster_hp, config.monster_die)]
+    special = dict(zip(HERO_CLASSES, config.special))
+    return tuple(
+        simulate_batch(runs, hero_class, seed + k, monsters=monsters, attack_die=config.hero_die,
+                       crit_chance=config.crit, special_bonus=special,
+                       potion_heal=config.potion_heal)["clear_rate"]
+        for k, hero_class in enumerate(HERO_CLASSES)
+    )
+
+class BalanceTable:
+    # Clear rates per config, kept in a sorted plain-text file. Configs
+    # already in the file are never evaluated again.
+    def __init__(self, path=TABLE_PATH, runs=20_000, seed=0):
+        self.path = path
+        self.header = f"# runs={runs} seed={seed} classes={'/'.join(HERO_CLASSES)}"
+        self.runs = runs
+        self.seed = seed
+        self.results = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                lines = f.read().splitlines()
+            # A table made with other settings is kept for comparison, not
+            # reused or overwritten.
+            if lines and lines[0] != self.header:
+                raise ValueError(f"{path} was made with other settings ({lines[0]}); "
+                                 "pass --table to start a new one")
+            for line in lines[1:]:
+                config, rates = line.split(" | ")
+                self.results[parse_config(config)] = tuple(float(r) for r in rates.split())
+
+    def evaluate(self, configs, pool=None):
+        todo = [c for c in dict.fromkeys(configs) if c not in self.results]
+        if todo:
+            args = (todo, [self.runs] * len(todo), [self.seed] * len(todo))
+            rates = pool.map(evaluate, *args) if pool else map(evaluate, *args)
+            self.results.update(zip(todo, rates))
+            self.save()
+        return [self.results[c] for c in configs]
+
+    def save(self):
+        if not self.path:
+            return
+        lines = sorted(f"{format_config(c)} | {' '.join(f'{r:.4f}' for r in rates)}"
+                       for c, rates in self.results.items())
+        with open(self.path, "w") as f:
+            f.write("\n".join([self.header] + lines) + "\n")
+
+def neighbours(config):
+    # One small step along each knob.
+    steps = []
+    for delta in (-1, 1):
+        scaled = tuple(max(1, round(hp * (1 + 0.05 * delta))) for hp in config.monster_hp)
+        steps.append(config._replace(monster_hp=scaled))
+        steps.append(config._replace(monster_hp=config.monster_hp[:-1] + (config.monster_hp[-1] + 5 * delta,)))
+        steps.append(config._replace(monster_die=config.monster_die[:-1] + (config.monster_die[-1] + delta,)))
+        for k in range(len(config.special)):
+            special = list(config.special)
+            special[k] += delta
+            steps.append(config._replace(special=tuple(special)))
+        steps.append(config._replace(crit=round(config.crit + 0.02 * delta, 2)))
+        steps.append(config._replace(potion_heal=config.potion_heal + 5 * delta))
+    return [c for c in steps
+            if min(c.monster_hp) >= 1 and min(c.monster_die) >= 1 and min(c.special) >= 0
+            and 0 <= c.crit <= 1 and c.potion_heal >= 0]
+
+def loss(rates, targets):
+    return sum((r - t) ** 2 for r, t in zip(rates, targets))
+
+def tune(table, targets, start=None, pool=None, max_rounds=30, report=print):
+    # Greedy local search: move to the best neighbour until none gets the
+    # clear rates closer to the targets.
+    best = start or base_config()
+    best_loss = loss(table.evaluate([best], pool)[0], targets)
+    for round_ in range(max_rounds):
+        candidates = neighbours(best)
+        losses = [loss(r, targets) for r in table.evaluate(candidates, pool)]
+        k = min(range(len(candidates)), key=losses.__getitem__)
+        if losses[k] >= best_loss:
+            break
+        best, best_loss = candidates[k], losses[k]
+        report(f"round {round_ + 1}: {format_config(best)}  loss {best_loss:.5f}")
+    return best
+
+def grid(base, hp_scale=(1.0,), boss_die=None, crit=None, potion_heal=None):
+    configs = []
+    for scale, die, chance, heal in itertools.product(
+            hp_scale, boss_die or [base.monster_die[-1]], crit or [base.crit],
+            potion_heal or [base.potion_heal]):
+        configs.append(base._replace(
+            monster_hp=tuple(max(1, round(hp * scale)) for hp in base.monster_hp),
+            monster_die=base.monster_die[:-1] + (die,),
+            crit=round(chance, 2), potion_heal=heal))
+    return configs
+
+def show(configs, rates):
+    print(" ".join(f"{c:>8}" for c in HERO_CLASSES) + "  config")
+    for config, row in zip(configs, rates):
+        print(" ".join(f"{r:8.2%}" for r in row) + f"  {format_config(config)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Dungeon Dice balance sweeps")
+    parser.add_argument("mode", choices=["sweep", "tune"], nargs="?", default="sweep")
+    parser.add_argument("--runs", type=int, default=20_000, help="runs per class and config")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--table", default=TABLE_PATH)
+    parser.add_argument("--hp-scale", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--boss-die", type=int, nargs="+")
+    parser.add_argument("--crit", type=float, nargs="+")
+    parser.add_argument("--heal", type=int, nargs="+")
+    parser.add_argument("--target", type=float, nargs="+", default=[0.5],
+                        help=f"clear rate to aim for, one for all or one per class ({'/'.join(HERO_CLASSES)})")
+    args = parser.parse_args()
+
+    table = BalanceTable(args.table, args.runs, args.seed)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        if args.mode == "sweep":
+            configs = grid(base_config(), args.hp_scale, args.boss_die, args.crit, args.heal)
+            show(configs, table.evaluate(configs, pool))
+        else:
+            targets = args.target * len(HERO_CLASSES) if len(args.target) == 1 else args.target
+            best = tune(table, targets, pool=pool)
+            show([best], table.evaluate([best]))
+    print(f"{len(table.results)} configs in {args.table}")
+
+if __name__ == "__main__":
+    main()
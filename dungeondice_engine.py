@@ -0,0 +1,245 @@
+# dungeondice_engine.py
+import argparse
+import logging
+import time
+from collections import deque
+
+import numpy as np
+
+from dungeondice import (CRIT_CHANCE, HERO_CLASSES, POTION_CHANCE, POTION_HEAL, REST_HEAL,
+                         ROGUE_CRIT, SPECIAL_BONUS, SWORD_CHANCE, Player, make_monsters)
+
+DICE_BATCH = 65_536
+HEAL_AT = 11  # no single hit does more than 11, so healing here never wastes a life
+
+# Event sinks receive emit(kind, **data) for every roll and state change.
+class NullSink:
+    def emit(self, kind, **data):
+        pass
+
+class RingSink:
+    # Keeps the last `size` events in memory.
+    def __init__(self, size=1000):
+        self.events = deque(maxlen=size)
+
+    def emit(self, kind, **data):
+        self.events.append((kind, data))
+
+class LogSink:
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger("dungeondice")
+        self.level = level
+
+    def emit(self, kind, **data):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s %s", kind, data)
+
+NULL_SINK = NullSink()
+
+class Dice:
+    # Uniform draws are made by NumPy in batches and handed out one by one.
+    def __init__(self, seed=None, batch=DICE_BATCH):
+        self.rng = np.random.default_rng(seed)
+        self.batch = batch
+        self.buffer = []
+        self.pos = 0
+
+    def random(self):
+        if self.pos == len(self.buffer):
+            self.buffer = self.rng.random(self.batch).tolist()
+            self.pos = 0
+        self.pos += 1
+        return self.buffer[self.pos - 1]
+
+    def roll(self, sides):
+        return int(self.random() * sides) + 1
+
+def attack_roll(character, dice, use_special=False):
+    # Character.attack, Player.attack and the boss attack without the prints.
+    if getattr(character, "is_boss", False):
+        return max(dice.roll(character.attack_die), dice.roll(character.attack_die))
+    roll = dice.roll(character.attack_die)
+    if use_special and not character.special_used:
+        character.special_used = True
+        roll += SPECIAL_BONUS.get(character.hero_class, 0)
+    if dice.random() <= CRIT_CHANCE:
+        roll *= ROGUE_CRIT if getattr(character, "hero_class", None) == "Rogue" else 2
+    return int(roll)
+
+def defense_roll(character, dice):
+    roll = dice.roll(character.defense_die)
+    if dice.random() <= CRIT_CHANCE:
+        roll *= 2
+    return roll
+
+def threshold_policy(player, monster):
+    # Open every fight with the special and drink a potion at HEAL_AT or less.
+    if player.hp <= HEAL_AT and player.inventory["Potion"] > 0:
+        return "heal"
+    return "attack" if player.special_used else "special"
+
+def fight(player, monster, dice, sink=NULL_SINK, policy=threshold_policy):
+    # dungeondice.fight with the choices made by policy(player, monster),
+    # which returns "attack", "special" or "heal". Returns True on a win.
+    sink.emit("encounter", monster=monster.name, hp=monster.hp)
+    while True:
+        action = policy(player, monster)
+        if action == "heal":
+            if not player.inventory["Potion"]:
+                raise ValueError("policy chose to heal with no potions left")
+            player.hp = min(player.max_hp, player.hp + POTION_HEAL)
+            player.inventory["Potion"] -= 1
+            sink.emit("heal", name=player.name, hp=player.hp)
+            continue
+
+        roll = attack_roll(player, dice, action == "special")
+        guard = defense_roll(monster, dice)
+        dmg = max(0, roll - guard)
+        monster.hp -= dmg
+        sink.emit("attack", name=player.name, roll=roll, defense=guard, damage=dmg)
+        if monster.hp <= 0:
+            sink.emit("victory", name=player.name, monster=monster.name)
+            loot_chance = dice.random()
+            if loot_chance < POTION_CHANCE:
+                player.inventory["Potion"] += 1
+                sink.emit("loot", item="Potion")
+            elif loot_chance < POTION_CHANCE + SWORD_CHANCE:
+                player.inventory["Sword"] += 1
+                player.attack_die += 1
+                sink.emit("loot", item="Sword")
+            return True
+
+        roll = attack_roll(monster, dice)
+        guard = defense_roll(player, dice)
+        dmg = max(0, roll - guard)
+        player.hp -= dmg
+        sink.emit("defend", name=monster.name, roll=roll, defense=guard, damage=dmg)
+        if player.hp <= 0:
+            sink.emit("defeat", name=player.name, monster=monster.name)
+            return False
+
+def dungeon_run(hero_class, dice, sink=NULL_SINK, policy=threshold_policy, name="Hero"):
+    # dungeondice.dungeon_run without the prompts; returns a result dict.
+    player = Player(name, hero_class)
+    defeated = 0
+    for monster in make_monsters():
+        if not fight(player, monster, dice, sink, policy):
+            break
+        defeated += 1
+        heal = min(REST_HEAL, player.max_hp - player.hp)
+        player.hp += heal
+        player.special_used = False
+        sink.emit("rest", name=player.name, heal=heal, hp=player.hp)
+    return {
+        "cleared": player.hp > 0,
+        "defeated": defeated,
+        "hp": max(0, player.hp),
+        "inventory": dict(player.inventory),
+    }
+
+def simulate(runs, hero_class, seed=None, sink=NULL_SINK, policy=threshold_policy):
+    dice = Dice(seed)
+    cleared = 0
+    defeated = [0] * (len(make_monsters()) + 1)
+    for _ in range(runs):
+        result = dungeon_run(hero_class, dice, sink, policy)
+        cleared += result["cleared"]
+        defeated[result["defeated"]] += 1
+    return {"runs": runs, "clear_rate": cleared / runs, "defeated": defeated}
+
+def simulate_batch(runs, hero_class, seed=None, heal_at=HEAL_AT, monsters=None, attack_die=None,
+                   crit_chance=CRIT_CHANCE, special_bonus=SPECIAL_BONUS, potion_heal=POTION_HEAL):
+    # All runs in lockstep with threshold_policy's choices: every step each
+    # unfinished run either drinks a potion or plays one exchange, with the
+    # dice for the whole step drawn at once. No events are emitted. The
+    # keyword arguments override the game's rules, for balancing.
+    rng = np.random.default_rng(seed)
+    monsters = monsters or make_monsters()
+    mon_hp = np.array([m.hp for m in monsters])
+    mon_attack = np.array([m.attack_die for m in monsters])
+    mon_defense = np.array([m.defense_die for m in monsters])
+    mon_boss = np.array([m.is_boss for m in monsters])
+    hero = Player("", hero_class)
+    bonus = special_bonus.get(hero_class, 0)
+    crit = ROGUE_CRIT if hero_class == "Rogue" else 2
+
+    hp = np.full(runs, hero.hp)
+    attack_die = np.full(runs, attack_die or hero.attack_die)
+    potions = np.full(runs, hero.inventory["Potion"])
+    special_used = np.zeros(runs, dtype=bool)
+    stage = np.zeros(runs, dtype=np.intp)
+    enemy_hp = np.full(runs, mon_hp[0])
+    active = np.arange(runs)
+    while active.size:
+        heal = (hp[active] <= heal_at) & (potions[active] > 0)
+        idx = active[heal]
+        hp[idx] = np.minimum(hero.max_hp, hp[idx] + potion_heal)
+        potions[idx] -= 1
+
+        idx = active[~heal]
+        u = rng.random((8, idx.size), dtype=np.float32)
+        roll = (u[0] * attack_die[idx]).astype(np.int64) + 1
+        roll = roll + np.where(special_used[idx], 0, bonus)
+        special_used[idx] = True
+        roll = np.where(u[1] <= crit_chance, (roll * crit).astype(np.int64), roll)
+        guard = (u[2] * mon_defense[stage[idx]]).astype(np.int64) + 1
+        guard = np.where(u[3] <= crit_chance, guard * 2, guard)
+        enemy_hp[idx] -= np.maximum(0, roll - guard)
+
+        won = enemy_hp[idx] <= 0
+        sides = mon_attack[stage[idx]]
+        roll = (u[4] * sides).astype(np.int64) + 1
+        second = (u[5] * sides).astype(np.int64) + 1
+        boss = mon_boss[stage[idx]]
+        roll = np.where(boss, np.maximum(roll, second),
+                        np.where(u[5] <= crit_chance, roll * 2, roll))
+        guard = (u[6] * hero.defense_die).astype(np.int64) + 1
+        guard = np.where(u[7] <= crit_chance, guard * 2, guard)
+        hp[idx] -= np.where(won, 0, np.maximum(0, roll - guard))
+
+        # Loot (reusing a draw the winners did not need), rest and next monster.
+        win_idx = idx[won]
+        loot = u[4][won]
+        potions[win_idx] += loot < POTION_CHANCE
+        attack_die[win_idx] += (loot >= POTION_CHANCE) & (loot < POTION_CHANCE + SWORD_CHANCE)
+        hp[win_idx] = np.minimum(hero.max_hp, hp[win_idx] + REST_HEAL)
+        special_used[win_idx] = False
+        stage[win_idx] += 1
+        enemy_hp[win_idx] = mon_hp[np.minimum(stage[win_idx], len(monsters) - 1)]
+
+        active = active[(hp[active] > 0) & (stage[active] < len(monsters))]
+    cleared = stage == len(monsters)
+    return {
+        "runs": runs,
+        "clear_rate": float(cleared.mean()),
+        "defeated": np.bincount(stage, minlength=len(monsters) + 1).tolist(),
+        "hp": hp,
+        "attack_die": attack_die,
+        "potions": potions,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Dungeon Dice simulator")
+    parser.add_argument("--hero", choices=HERO_CLASSES, default="Warrior")
+    parser.add_argument("--runs", type=int, default=100_000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--mode", choices=["batch", "engine", "log"], default="batch",
+                        help="lockstep NumPy batch, the per-run engine, or one logged run")
+    args = parser.parse_args()
+
+    if args.mode == "log":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        print(dungeon_run(args.hero, Dice(args.seed), LogSink()))
+        return
+    start = time.perf_counter()
+    if args.mode == "batch":
+        stats = simulate_batch(args.runs, args.hero, args.seed)
+    else:
+        stats = simulate(args.runs, args.hero, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{args.hero}: cleared {stats['clear_rate']:.2%} of {args.runs:,} runs")
+    print(f"Runs ending at each monster: {stats['defeated']}")
+    print(f"Speed: {args.runs / elapsed:,.0f} runs/s")
+
+if __name__ == "__main__":
+    main()
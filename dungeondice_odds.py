@@ -0,0 +1,187 @@
+# dungeondice_odds.py
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from dungeondice import (CRIT_CHANCE, HERO_CLASSES, REST_HEAL, ROGUE_CRIT, SPECIAL_BONUS,
+                         SWORD_CHANCE, Player, make_monsters)
+
+CRIT_FACTOR = {"Rogue": ROGUE_CRIT}
+
+# A distribution is a tuple of probabilities indexed by value, so it can be
+# used as a cache key.
+
+def die(sides, bonus=0):
+    dist = [0.0] * (sides + bonus + 1)
+    for roll in range(1, sides + 1):
+        dist[roll + bonus] = 1 / sides
+    return tuple(dist)
+
+def best_of_two(sides):
+    # max of two rolls, as in the boss attack
+    return tuple((2 * k - 1) / sides ** 2 if k else 0.0 for k in range(sides + 1))
+
+def with_crit(dist, factor=2):
+    out = [0.0] * (int((len(dist) - 1) * factor) + 1)
+    for value, p in enumerate(dist):
+        out[value] += (1 - CRIT_CHANCE) * p
+        out[int(value * factor)] += CRIT_CHANCE * p
+    return tuple(out)
+
+def damage(attack, defense):
+    # distribution of max(0, attack - defense)
+    out = [0.0] * len(attack)
+    for a, pa in enumerate(attack):
+        for d, pd in enumerate(defense):
+            out[max(0, a - d)] += pa * pd
+    return tuple(out)
+
+def player_attack(hero_class, attack_die, special=False):
+    bonus = SPECIAL_BONUS[hero_class] if special else 0
+    return with_crit(die(attack_die, bonus), CRIT_FACTOR.get(hero_class, 2))
+
+def monster_attack(monster):
+    if monster.is_boss:
+        return best_of_two(monster.attack_die)
+    return with_crit(die(monster.attack_die))
+
+def defense(character):
+    return with_crit(die(character.defense_die))
+
+class _Chain:
+    # Exact solution of one fight's HP Markov chain for one pair of damage
+    # distributions. W[m] is a (max_hp + 1, max_hp + 2) matrix for a fight
+    # that starts with the monster at m HP and the player to attack: row p
+    # is the starting player HP, column q <= max_hp the chance of winning
+    # with q HP left and the last column the expected number of exchanges.
+    # U[m] is the same right after the player's attack, monster to attack.
+    # Rows are built for increasing m, so every monster HP shares them.
+    def __init__(self, hit, hurt, max_hp):
+        self.hit = np.array(hit)
+        self.max_hp = max_hp
+        size = max_hp + 1
+        shift = np.zeros((size, size))
+        for p in range(1, size):
+            for q in range(max(1, p - len(hurt) + 1), p + 1):
+                shift[p, q] = hurt[p - q]
+        self.shift = shift
+        # Exchanges where neither side does damage loop back to the same
+        # state; solving (I - P(miss) * shift) folds them in.
+        self.solve = np.linalg.inv(np.eye(size) - self.hit[0] * shift)
+        self.win = np.zeros((size, size + 1))
+        self.win[1:, 1:size] = np.eye(max_hp)
+        self.win[1:, size] = 1.0
+        self.turn = np.zeros((size, size + 1))
+        self.turn[1:, size] = 1.0
+        self.W = np.zeros((1,) + self.win.shape)
+        self.U = np.zeros((1,) + self.win.shape)
+        self.built = 0
+
+    def _first(self, hit, m):
+        # Outcome of the first attack from (p, m) with attack damage hit; the
+        # a = 0 term is left to the caller.
+        tail = hit[m:].sum()
+        out = tail * self.win + (1 - tail) * self.turn
+        k = min(m, len(hit))
+        return out + np.tensordot(hit[1:k], self.U[m - 1:m - k:-1], axes=1)
+
+    def rows(self, m):
+        if m >= len(self.W):
+            grow = max(m + 1, 2 * len(self.W)) - len(self.W)
+            self.W = np.concatenate([self.W, np.zeros((grow,) + self.win.shape)])
+            self.U = np.concatenate([self.U, np.zeros((grow,) + self.win.shape)])
+        while self.built < m:
+            k = self.built + 1
+            self.W[k] = self.solve @ self._first(self.hit, k)
+            self.U[k] = self.shift @ self.W[k]
+            self.built = k
+        return self.W[m]
+
+    def opening(self, hit, m):
+        # Like rows(m), but the first attack uses its own distribution.
+        self.rows(m)
+        hit = np.array(hit)
+        return self._first(hit, m) + hit[0] * self.U[m]
+
+@lru_cache(maxsize=None)
+def _chain(hit, hurt, max_hp):
+    return _Chain(hit, hurt, max_hp)
+
+def fight_matrix(hero_class, attack_die, monster, special=True, max_hp=None):
+    # Row p: outcome of a fight started at p HP, see _Chain. The player
+    # always attacks (potions are never drunk) and, with special=True,
+    # opens with the special.
+    player = Player("", hero_class)
+    max_hp = max_hp or player.max_hp
+    hurt = damage(monster_attack(monster), defense(player))
+    mdef = defense(monster)
+    chain = _chain(damage(player_attack(hero_class, attack_die), mdef), hurt, max_hp)
+    if not special:
+        return chain.rows(monster.hp)
+    return chain.opening(damage(player_attack(hero_class, attack_die, True), mdef), monster.hp)
+
+def fight_odds(hero_class, monster, player_hp=None, attack_die=6, special=True):
+    player = Player("", hero_class)
+    player_hp = player.max_hp if player_hp is None else player_hp
+    row = fight_matrix(hero_class, attack_die, monster, special, player.max_hp)[player_hp]
+    win = row[:-1].sum()
+    return {
+        "win": win,
+        "turns": row[-1],
+        "hp": (row[:-1] @ np.arange(len(row) - 1)) / win if win else 0.0,
+        "hp_dist": row[:-1],
+    }
+
+def run_odds(hero_class, monsters=None, special=True):
+    # Chains the fights of one dungeon_run: the player's state between
+    # fights is (HP, attack die), and a Sword from the loot adds 1 to the die.
+    monsters = monsters or make_monsters()
+    player = Player("", hero_class)
+    max_hp = player.max_hp
+    heal = np.minimum(np.arange(max_hp + 1) + REST_HEAL, max_hp)
+    heal[0] = 0
+    states = {player.attack_die: np.eye(max_hp + 1)[max_hp]}
+    reached = 1.0
+    report = []
+    for monster in monsters:
+        after = {}
+        won = turns = 0.0
+        for die_, dist in states.items():
+            matrix = fight_matrix(hero_class, die_, monster, special, max_hp)
+            end = dist @ matrix
+            turns += end[-1]
+            end = end[:-1]
+            won += end.sum()
+            for next_die, p in ((die_, 1 - SWORD_CHANCE), (die_ + 1, SWORD_CHANCE)):
+                rested = np.bincount(heal, weights=end * p, minlength=max_hp + 1)
+                after[next_die] = after.get(next_die, 0) + rested
+        report.append({
+            "monster": monster.name,
+            "reach": reached,
+            "win": won / reached if reached else 0.0,
+            "turns": turns / reached if reached else 0.0,
+            "hp": sum(d @ np.arange(max_hp + 1) for d in after.values()) / won if won else 0.0,
+        })
+        reached = won
+        states = after
+    return reached, report
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact Dungeon Dice win odds")
+    parser.add_argument("--hero", choices=HERO_CLASSES, nargs="+", default=HERO_CLASSES)
+    parser.add_argument("--no-special", action="store_true", help="never use the special ability")
+    args = parser.parse_args()
+
+    for hero_class in args.hero:
+        start = time.perf_counter()
+        survive, report = run_odds(hero_class, special=not args.no_special)
+        elapsed = time.perf_counter() - start
+        print(f"\n{hero_class}: clears the dungeon {survive:.2%} of the time ({elapsed * 1000:.1f} ms)")
+        for fight in report:
+            print(f"  {fight['monster']:<12} reached {fight['reach']:7.2%}  win {fight['win']:7.2%}  "
+                  f"{fight['turns']:5.2f} exchanges  {fight['hp']:5.1f} HP after resting")
+
+if __name__ == "__main__":
+    main()
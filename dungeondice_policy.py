@@ -0,0 +1,174 @@
+# dungeondice_policy.py
+import argparse
+import os
+import time
+
+import numpy as np
+
+from dungeondice import (HERO_CLASSES, POTION_CHANCE, POTION_HEAL, REST_HEAL, SWORD_CHANCE, Player,
+                         make_monsters)
+from dungeondice_engine import simulate, threshold_policy
+from dungeondice_odds import damage, defense, monster_attack, player_attack
+
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+ACTIONS = ["attack", "special", "heal"]
+ATTACK, SPECIAL, HEAL = range(3)
+
+# Tables are indexed [monster index, attack die - starting die, potions,
+# special_used, player HP, monster HP]. Every monster won adds at most one
+# potion or one die size, so fight i needs i + 1 of each axis beyond the
+# starting values.
+
+def table_path(hero_class):
+    return os.path.join(TABLE_DIR, f"dungeondice_policy_{hero_class.lower()}.npz")
+
+def _shift(hurt, size):
+    # shift[p, q]: chance a monster attack takes the player from p to q > 0 HP.
+    shift = np.zeros((size, size))
+    for p in range(1, size):
+        for q in range(max(1, p - len(hurt) + 1), p + 1):
+            shift[p, q] = hurt[p - q]
+    return shift
+
+def _after_hit(hit, shifted, won, m):
+    # Value of an attack with damage distribution hit from every player HP
+    # against a monster at m, given shifted[:, m'] (the value after the
+    # monster's reply at m') for m' < m and won (the value after a kill).
+    tail = hit[m:].sum()
+    k = min(m, len(hit))
+    return tail * won + shifted[:, m - 1:m - k:-1] @ hit[1:k]
+
+def _solve_table(hit, hit_special, hurt, shift, won, monster_hp, special=None, healed=None):
+    # One (monster, die, potions, special_used) slice. special is the
+    # special_used=True slice when the special is still available; healed
+    # is the slice with one potion fewer when a potion is at hand.
+    size = len(won)
+    value = np.zeros((size, monster_hp + 1))
+    action = np.zeros((size, monster_hp + 1), dtype=np.uint8)
+    shifted = np.zeros_like(value)
+    other = np.full_like(value, -1.0)
+    choice = np.zeros_like(action)
+    if special is not None:
+        shifted_special = shift @ special
+        for m in range(1, monster_hp + 1):
+            other[:, m] = _after_hit(hit_special, shifted_special, won, m) + hit_special[0] * shifted_special[:, m]
+        choice[:] = SPECIAL
+    if healed is not None:
+        heal = healed[np.minimum(np.arange(size) + POTION_HEAL, size - 1)]
+        better = heal > other
+        other[better] = heal[better]
+        choice[better] = HEAL
+
+    hurt = hurt.tolist()
+    stay = hit[0] * hurt[0]  # neither side does damage
+    for m in range(1, monster_hp + 1):
+        base = _after_hit(hit, shifted, won, m).tolist()
+        column = [0.0] * size
+        for p in range(1, size):
+            # A blocked attack and a wounding reply stays in this column.
+            x = base[p]
+            for b in range(1, min(p, len(hurt))):
+                x += hit[0] * hurt[b] * column[p - b]
+            attack = x / (1 - stay)
+            if attack >= other[p, m]:
+                column[p] = attack
+            else:
+                column[p] = other[p, m]
+                action[p, m] = choice[p, m]
+        value[:, m] = column
+        shifted[:, m] = shift @ value[:, m]
+    return value, action
+
+def build_tables(hero_class):
+    monsters = make_monsters()
+    hero = Player("", hero_class)
+    size = hero.max_hp + 1
+    stages = len(monsters)
+    max_hp = max(m.hp for m in monsters)
+    shape = (stages, stages, hero.inventory["Potion"] + stages, 2, size, max_hp + 1)
+    value = np.zeros(shape, dtype=np.float32)
+    action = np.zeros(shape, dtype=np.uint8)
+    rest = np.minimum(np.arange(size) + REST_HEAL, hero.max_hp)
+
+    for i in reversed(range(stages)):
+        monster = monsters[i]
+        hurt = np.array(damage(monster_attack(monster), defense(hero)))
+        shift = _shift(hurt, size)
+        mdef = defense(monster)
+        for extra_die in range(i + 1):
+            die = hero.attack_die + extra_die
+            hit = np.array(damage(player_attack(hero_class, die), mdef))
+            hit_special = np.array(damage(player_attack(hero_class, die, True), mdef))
+            for potions in range(hero.inventory["Potion"] + i + 1):
+                if i == stages - 1:
+                    won = np.ones(size)
+                else:
+                    # Loot, the rest between fights, then the next monster fresh.
+                    nxt = value[i + 1, :, :, 0, :, monsters[i + 1].hp]
+                    won = (POTION_CHANCE * nxt[extra_die, potions + 1]
+                           + SWORD_CHANCE * nxt[extra_die + 1, potions]
+                           + (1 - POTION_CHANCE - SWORD_CHANCE) * nxt[extra_die, potions])[rest].astype(float)
+                won[0] = 0.0
+                solved = {}
+                for used in (1, 0):
+                    special = None if used else solved[1]
+                    healed = previous[used] if potions else None
+                    v, a = _solve_table(hit, hit_special, hurt, shift, won, monster.hp, special, healed)
+                    solved[used] = v
+                    value[i, extra_die, potions, used, :, :monster.hp + 1] = v
+                    action[i, extra_die, potions, used, :, :monster.hp + 1] = a
+                previous = solved
+    return value, action
+
+def save_tables(tables, path):
+    value, action = tables
+    np.savez_compressed(path, value=value, action=action)
+
+def load_tables(hero_class, path=None, rebuild=False):
+    path = path or table_path(hero_class)
+    if rebuild or not os.path.exists(path):
+        save_tables(build_tables(hero_class), path)
+    with np.load(path) as data:
+        return data["value"], data["action"]
+
+MONSTER_INDEX = {m.name: i for i, m in enumerate(make_monsters())}
+
+def load_policy(hero_class, path=None):
+    # A policy for dungeondice_engine (policy(player, monster) -> action)
+    # that is a single table read.
+    _, action = load_tables(hero_class, path)
+    base_die = Player("", hero_class).attack_die
+
+    def policy(player, monster):
+        return ACTIONS[action[MONSTER_INDEX[monster.name], player.attack_die - base_die,
+                              player.inventory["Potion"], int(player.special_used),
+                              player.hp, monster.hp]]
+
+    return policy
+
+def win_chance(value, hero_class):
+    # Chance of clearing the dungeon from the start with optimal play.
+    hero = Player("", hero_class)
+    return float(value[0, 0, hero.inventory["Potion"], 0, hero.hp, make_monsters()[0].hp])
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimal Dungeon Dice policy tables")
+    parser.add_argument("--hero", choices=HERO_CLASSES, nargs="+", default=HERO_CLASSES)
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--runs", type=int, default=20_000, help="simulated runs to check each policy")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    for hero_class in args.hero:
+        start = time.perf_counter()
+        value, _ = load_tables(hero_class, rebuild=args.rebuild)
+        elapsed = time.perf_counter() - start
+        print(f"\n{hero_class}: {table_path(hero_class)} ({elapsed:.2f}s)")
+        print(f"  optimal play clears the dungeon {win_chance(value, hero_class):.2%} of the time")
+        if args.runs:
+            for name, policy in (("table", load_policy(hero_class)), ("threshold", threshold_policy)):
+                stats = simulate(args.runs, hero_class, args.seed, policy=policy)
+                print(f"  {name:<9} policy over {args.runs:,} runs: {stats['clear_rate']:.2%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# dungeondice_raid.py
+import argparse
+import time
+
+import numpy as np
+
+from dungeondice import (CRIT_CHANCE, HERO_CLASSES, ROGUE_CRIT, SPECIAL_BONUS, Monster, Player,
+                         fight, make_monsters)
+
+HEROES, MONSTERS = 0, 1
+
+class Encounter:
+    # Every combatant of a raid as one row of parallel arrays. Heroes are
+    # side 0 and monsters side 1; views() gives Character-like objects for
+    # single fights.
+    FIELDS = {
+        "side": np.int8, "hp": np.int64, "max_hp": np.int64, "attack_die": np.int64,
+        "defense_die": np.int64, "is_boss": bool, "crit_factor": np.float64,
+        "special_bonus": np.int64, "special_used": bool,
+    }
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.names = []
+        self.hero_classes = []
+        self.inventories = []
+        for field, dtype in self.FIELDS.items():
+            setattr(self, field, np.zeros(0, dtype=dtype))
+        self.rounds = 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, side, count, hp, attack_die=6, defense_die=6, is_boss=False, name=None,
+            hero_class=None):
+        # count identical combatants; returns their indices.
+        start = len(self)
+        crit = ROGUE_CRIT if hero_class == "Rogue" else 2
+        values = {
+            "side": side, "hp": hp, "max_hp": hp, "attack_die": attack_die,
+            "defense_die": defense_die, "is_boss": is_boss, "crit_factor": crit,
+            "special_bonus": SPECIAL_BONUS.get(hero_class, 0), "special_used": False,
+        }
+        for field, dtype in self.FIELDS.items():
+            column = np.full(count, values[field], dtype=dtype)
+            setattr(self, field, np.concatenate([getattr(self, field), column]))
+        base = name or hero_class or "Monster"
+        self.names += [base if count == 1 else f"{base} {k + 1}" for k in range(count)]
+        self.hero_classes += [hero_class] * count
+        self.inventories += [{"Potion": 1, "Sword": 0} if side == HEROES else None for _ in range(count)]
+        return np.arange(start, len(self))
+
+    def add_character(self, character):
+        if isinstance(character, Player):
+            index = self.add(HEROES, 1, character.max_hp, character.attack_die,
+                             character.defense_die, name=character.name,
+                             hero_class=character.hero_class)[0]
+            self.special_used[index] = character.special_used
+            self.inventories[index] = dict(character.inventory)
+        else:
+            index = self.add(MONSTERS, 1, character.max_hp, character.attack_die,
+                             character.defense_die, getattr(character, "is_boss", False),
+                             character.name)[0]
+        self.hp[index] = character.hp
+        return index
+
+    def alive(self, side):
+        return np.flatnonzero((self.side == side) & (self.hp > 0))
+
+    def _attacks(self, attackers):
+        sides = self.attack_die[attackers]
+        first = self.rng.integers(1, sides + 1)
+        second = self.rng.integers(1, sides + 1)
+        boss = self.is_boss[attackers]
+        unused = ~self.special_used[attackers]
+        roll = first + np.where(unused, self.special_bonus[attackers], 0)
+        self.special_used[attackers] = True
+        crit = (self.rng.random(len(attackers)) <= CRIT_CHANCE) & ~boss
+        roll = np.where(crit, (roll * self.crit_factor[attackers]).astype(np.int64), roll)
+        # Bosses roll twice and keep the better raw roll: no special, no crits.
+        return np.where(boss, np.maximum(first, second), roll)
+
+    def _defenses(self, defenders):
+        roll = self.rng.integers(1, self.defense_die[defenders] + 1)
+        crit = self.rng.random(len(defenders)) <= CRIT_CHANCE
+        return np.where(crit, roll * 2, roll)
+
+    def _volley(self, side):
+        # Every living combatant of side attacks a random living enemy, and
+        # each attack is defended on its own as in fight().
+        attackers = self.alive(side)
+        targets = self.alive(1 - side)
+        if not attackers.size or not targets.size:
+            return 0
+        targets = targets[self.rng.integers(len(targets), size=len(attackers))]
+        dmg = np.maximum(0, self._attacks(attackers) - self._defenses(targets))
+        self.hp -= np.bincount(targets, weights=dmg, minlength=len(self)).astype(np.int64)
+        return int(dmg.sum())
+
+    def step(self):
+        # One round: the heroes strike first, then the monsters still
+        # standing strike back, as in fight().
+        self.rounds += 1
+        dealt = self._volley(HEROES)
+        taken = self._volley(MONSTERS)
+        return dealt, taken
+
+    def winner(self):
+        if not self.alive(MONSTERS).size:
+            return HEROES
+        if not self.alive(HEROES).size:
+            return MONSTERS
+        return None
+
+    def run(self, max_rounds=10_000):
+        while self.winner() is None and self.rounds < max_rounds:
+            self.step()
+        return self.winner()
+
+    def view(self, index):
+        return (PlayerView if self.side[index] == HEROES else MonsterView)(self, index)
+
+    def views(self, side=None):
+        return [self.view(i) for i in range(len(self)) if side is None or self.side[i] == side]
+
+class _Column:
+    # An attribute stored in one of the encounter's arrays.
+    def __set_name__(self, owner, name):
+        self.field = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return getattr(view.encounter, self.field)[view.index].item()
+
+    def __set__(self, view, value):
+        getattr(view.encounter, self.field)[view.index] = value
+
+class MonsterView(Monster):
+    # A Monster whose stats live in an Encounter, for dungeondice.fight.
+    hp = _Column()
+    max_hp = _Column()
+    attack_die = _Column()
+    defense_die = _Column()
+    is_boss = _Column()
+
+    def __init__(self, encounter, index):
+        self.encounter = encounter
+        self.index = index
+        self.name = encounter.names[index]
+
+class PlayerView(Player):
+    hp = _Column()
+    max_hp = _Column()
+    attack_die = _Column()
+    defense_die = _Column()
+    special_used = _Column()
+
+    def __init__(self, encounter, index):
+        self.encounter = encounter
+        self.index = index
+        self.name = encounter.names[index]
+        self.hero_class = encounter.hero_classes[index]
+        self.inventory = encounter.inventories[index]
+
+def raid(heroes, monsters, seed=None):
+    # heroes per class against a horde of each regular monster plus one boss.
+    encounter = Encounter(seed)
+    for hero_class in HERO_CLASSES:
+        hero = Player("", hero_class)
+        encounter.add(HEROES, heroes, hero.max_hp, hero.attack_die, hero.defense_die,
+                      hero_class=hero_class)
+    kinds = make_monsters()
+    for kind in kinds:
+        count = 1 if kind.is_boss else monsters // (len(kinds) - 1)
+        encounter.add(MONSTERS, count, kind.hp, kind.attack_die, kind.defense_die,
+                      kind.is_boss, kind.name)
+    return encounter
+
+def main():
+    parser = argparse.ArgumentParser(description="Large Dungeon Dice encounters")
+    parser.add_argument("--heroes", type=int, default=1000, help="heroes of each class")
+    parser.add_argument("--monsters", type=int, default=10_000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--duel", action="store_true",
+                        help="play one interactive fight through the Character views")
+    args = parser.parse_args()
+
+    if args.duel:
+        encounter = Encounter(args.seed)
+        hero = encounter.add_character(Player("Hero", "Warrior"))
+        goblin = encounter.add_character(Monster("Goblin", 20))
+        fight(encounter.view(hero), encounter.view(goblin))
+        print(f"Arrays after the fight: hp={encounter.hp.tolist()}")
+        return
+
+    encounter = raid(args.heroes, args.monsters, args.seed)
+    start = time.perf_counter()
+    winner = encounter.run()
+    elapsed = time.perf_counter() - start
+    side = "Heroes" if winner == HEROES else "Monsters" if winner == MONSTERS else "Nobody"
+    print(f"{len(encounter):,} combatants: {side} win after {encounter.rounds} rounds")
+    print(f"Heroes standing: {len(encounter.alive(HEROES)):,}, "
+          f"monsters standing: {len(encounter.alive(MONSTERS)):,}")
+    print(f"Speed: {encounter.rounds / elapsed:,.0f} rounds/s "
+          f"({len(encounter) * encounter.rounds / elapsed:,.0f} combatant-rounds/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,62 @@
 # pet_battle_campaign_two_elements.py
+import csv
+import os
 import random
 import time
-
-ELEMENTS = ["Fire", "Water", "Grass"]
-
-def type_effectiveness(move_type, target_type):
-    if (move_type == "Fire" and target_type == "Grass") or \
-       (move_type == "Grass" and target_type == "Water") or \
-       (move_type == "Water" and target_type == "Fire"):
-        return 1.5  # super effective
-    elif (move_type == "Fire" and target_type == "Water") or \
-         (move_type == "Grass" and target_type == "Fire") or \
-         (move_type == "Water" and target_type == "Grass"):
-        return 0.5  # not effective
-    return 1  # normal
+from functools import lru_cache
+
+TYPES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "petbattle_types.csv")
+
+def load_types(path=TYPES_PATH):
+    # Rows are attacking types, columns defending types, in the same order.
+    with open(path, newline="") as f:
+        rows = [row for row in csv.reader(f) if row and not row[0].startswith("#")]
+    names = rows[0][1:]
+    if [row[0] for row in rows[1:]] != names:
+        raise ValueError(f"{path}: attack rows must match the defense columns")
+    chart = [[float(v) for v in row[1:]] for row in rows[1:]]
+    if any(len(row) != len(names) for row in chart):
+        raise ValueError(f"{path}: the chart must be square")
+    return names, chart
+
+ELEMENTS, TYPE_CHART = load_types()
+ELEMENT_ID = {name: i for i, name in enumerate(ELEMENTS)}
+# DUAL[m][a][b]: multiplier of a move of type m against a pet typed (a, b);
+# a single-typed pet has a == b and takes the multiplier once.
+DUAL = [[[row[a] * (row[b] if b != a else 1) for b in range(len(ELEMENTS))]
+         for a in range(len(ELEMENTS))] for row in TYPE_CHART]
+
+def type_effectiveness(move_type, target_type, target_type2=None):
+    # Types are element IDs; target_type2 is the defender's second type.
+    return DUAL[move_type][target_type][target_type if target_type2 is None else target_type2]
+
+def effectiveness_against(move, pet):
+    return DUAL[move["type_id"]][pet.type_ids[0]][pet.type_ids[1]]
+
+@lru_cache(maxsize=1)
+def dual_array():
+    # DUAL as a NumPy array, for batches; the game itself does not need NumPy.
+    import numpy as np
+    return np.array(DUAL)
+
+def damage_batch(power, move_types, types1, types2, rolls):
+    # Damage for many attacks at once, as player_turn computes it: every
+    # argument is an array (or a scalar) broadcast against the others.
+    return (power * dual_array()[move_types, types1, types2] * rolls).astype(int)
 
 class Pet:
     def __init__(self, name, element1, element2, level=1):
         self.name = name
         self.element1 = element1
         self.element2 = element2
+        self.type_ids = (ELEMENT_ID[element1], ELEMENT_ID[element2])
         self.level = level
         self.max_hp = 100 + (level - 1) * 10
         self.hp = self.max_hp
         self.xp = 0
         self.moves = {
-            f"{element1} Attack": {"power": 12, "type": element1},
-            f"{element2} Attack": {"power": 12, "type": element2}
+            f"{element1} Attack": {"power": 12, "type": element1, "type_id": ELEMENT_ID[element1]},
+            f"{element2} Attack": {"power": 12, "type": element2, "type_id": ELEMENT_ID[element2]}
         }
 
     def level_up(self):
@@ -53,7 +83,7 @@ def player_turn(player, enemy):
             print("❌ Invalid choice, try again.")
 
     move = player.moves[move_name]
-    effectiveness = type_effectiveness(move["type"], enemy.element1)
+    effectiveness = effectiveness_against(move, enemy)
     dmg = int(move["power"] * effectiveness * random.uniform(0.85, 1.15))
     enemy.hp -= dmg
     enemy.hp = max(0, enemy.hp)
@@ -67,21 +97,25 @@ def player_turn(player, enemy):
 
     print(f"🪶 {player.name} used {move_name} and dealt {dmg} damage! {eff_msg}")
 
-def enemy_turn(enemy, player):
-    # Smart AI: choose super effective move if available
-    best_move = None
-    best_effect = 0
-    for move_name, move in enemy.moves.items():
-        effect = type_effectiveness(move["type"], player.element1)
-        if effect > best_effect:
-            best_effect = effect
-            best_move = move_name
-
-    if not best_move:
-        best_move = random.choice(list(enemy.moves.keys()))
+def enemy_turn(enemy, player, choose_move=None):
+    if choose_move:
+        best_move = choose_move(enemy, player)
+        effectiveness = effectiveness_against(enemy.moves[best_move], player)
+    else:
+        # Smart AI: choose super effective move if available
+        best_move = None
+        effectiveness = 0
+        for move_name, move in enemy.moves.items():
+            effect = effectiveness_against(move, player)
+            if effect > effectiveness:
+                effectiveness = effect
+                best_move = move_name
+
+        if not best_move:
+            best_move = random.choice(list(enemy.moves.keys()))
+            effectiveness = effectiveness_against(enemy.moves[best_move], player)
 
     move = enemy.moves[best_move]
-    effectiveness = type_effectiveness(move["type"], player.element1)
     dmg = int(move["power"] * effectiveness * random.uniform(0.85, 1.15))
     player.hp -= dmg
     player.hp = max(0, player.hp)
@@ -95,7 +129,7 @@ def enemy_turn(enemy, player):
 
     print(f"💻 {enemy.name} used {best_move} and dealt {dmg} damage! {eff_msg}")
 
-def battle(player, enemy):
+def battle(player, enemy, enemy_ai=None):
     print(f"\n🎮 Battle Start! {player.name} ({player.element1}/{player.element2}) vs {enemy.name} ({enemy.element1})")
     time.sleep(1)
 
@@ -109,7 +143,7 @@ def battle(player, enemy):
             player_turn(player, enemy)
             turn = "enemy"
         else:
-            enemy_turn(enemy, player)
+            enemy_turn(enemy, player, enemy_ai)
             turn = "player"
         time.sleep(1)
 
@@ -125,7 +159,7 @@ def battle(player, enemy):
         print(f"💀 {player.name} was defeated by {enemy.name}!")
         return False
 
-def play_campaign():
+def play_campaign(enemy_ai=None):
     player_name = input("Enter your pet's name: ")
     element1, element2 = random.sample(ELEMENTS, 2)
     player = Pet(player_name, element1, element2)
@@ -138,7 +172,7 @@ def play_campaign():
         enemy_level = random.randint(max(1, player.level - 1), player.level + 1)
         enemy = Pet(enemy_name, enemy_element, enemy_element, level=enemy_level)
 
-        if not battle(player, enemy):
+        if not battle(player, enemy, enemy_ai):
             print("\n💔 Campaign over!")
             break
         else:
@@ -0,0 +1,211 @@
+# petbattle_ai.py
+import argparse
+import random
+import time
+
+import petbattle
+from petbattle import ELEMENTS, Pet
+
+BUCKETS = 5  # damage roll outcomes per chance node
+EXACT = 1 << 30  # depth stored for values searched to the end of the battle
+TIE = 1e-9  # win chances this close count as equal
+
+def roll_buckets(count=BUCKETS):
+    # Midpoints of equal-probability slices of uniform(0.85, 1.15).
+    return [0.85 + 0.3 * (i + 0.5) / count for i in range(count)]
+
+def move_key(pet):
+    return tuple((move["power"], move["type_id"]) for move in pet.moves.values())
+
+class _Timeout(Exception):
+    pass
+
+class ExpectiminimaxAI:
+    # Chooses the move that maximizes the chance of winning, looking ahead
+    # over both sides' moves with the damage roll as a chance node of
+    # BUCKETS outcomes. States are (my HP, their HP, my moves, their moves,
+    # whose turn); the moves stand for the elements. Values are cached by
+    # (state, depth left) for one move's search only: a value from another
+    # horizon would make siblings disagree, and the search could then
+    # prefer a move that does less damage on every roll.
+    def __init__(self, depth=8, budget_ms=20, buckets=BUCKETS):
+        self.max_depth = depth
+        self.budget_ms = budget_ms
+        self.rolls = roll_buckets(buckets)
+        self.cache = {}
+        self.damage = {}
+        self.options = {}
+        self.nodes = 0
+        self.deadline = 0.0
+        self.stats = {}
+
+    def _damage(self, move, defender_types):
+        key = (move, defender_types)
+        if key not in self.damage:
+            power, type_id = move
+            mult = petbattle.type_effectiveness(type_id, *defender_types)
+            self.damage[key] = tuple(int(power * mult * roll) for roll in self.rolls)
+        return self.damage[key]
+
+    def _options(self, moves, defender_types):
+        # Damage rolls of the moves worth searching. Lower enemy HP is never
+        # worse here, so a move that does no more damage than another on
+        # every roll is dropped, and so are duplicates.
+        key = (moves, defender_types)
+        if key not in self.options:
+            rolls = sorted({self._damage(m, defender_types) for m in moves}, reverse=True)
+            self.options[key] = [r for i, r in enumerate(rolls)
+                                 if not any(all(x >= y for x, y in zip(o, r)) for o in rolls[:i])]
+        return self.options[key]
+
+    def _estimate(self, state):
+        # Depth cut-off: compare how many average hits each side still needs.
+        hp_me, hp_opp, mine, theirs, types_me, types_opp, _ = state
+        dealt = max(sum(r) for r in self._options(mine, types_opp)) / len(self.rolls)
+        taken = max(sum(r) for r in self._options(theirs, types_me)) / len(self.rolls)
+        if not dealt:
+            return 0.0
+        if not taken:
+            return 1.0
+        need_me, need_opp = hp_opp / dealt, hp_me / taken
+        return need_opp / (need_me + need_opp)
+
+    def _value(self, state, depth):
+        # Win probability for "me"; returns (value, depth it is good for).
+        hp_me, hp_opp, mine, theirs, types_me, types_opp, my_turn = state
+        if hp_opp <= 0:
+            return 1.0, EXACT
+        if hp_me <= 0:
+            return 0.0, EXACT
+        key = (state, depth)
+        if key in self.cache:
+            return self.cache[key]
+        if depth == 0:
+            return self._estimate(state), 0
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+        best = None
+        good_for = EXACT
+        if my_turn:
+            options = self._options(mine, types_opp)
+        else:
+            options = self._options(theirs, types_me)
+        for rolls in options:
+            total = 0.0
+            for dmg in rolls:
+                if my_turn:
+                    child = (hp_me, hp_opp - dmg, mine, theirs, types_me, types_opp, False)
+                else:
+                    child = (hp_me - dmg, hp_opp, mine, theirs, types_me, types_opp, True)
+                value, searched = self._value(child, depth - 1)
+                total += value
+                good_for = min(good_for, searched + 1)
+            total /= len(self.rolls)
+            if best is None or (total > best if my_turn else total < best):
+                best = total
+        self.cache[key] = (best, good_for)
+        return best, good_for
+
+    def evaluate(self, me, opponent, my_turn=True):
+        # (win probability, best move name) for me against opponent.
+        state = (me.hp, opponent.hp, move_key(me), move_key(opponent),
+                 me.type_ids, opponent.type_ids, my_turn)
+        return self._search(state, list(me.moves))
+
+    def _search(self, state, names):
+        hp_me, hp_opp, mine, theirs, types_me, types_opp, _ = state
+        self.cache.clear()
+        start = time.perf_counter()
+        self.deadline = start + self.budget_ms / 1000
+        self.nodes = 0
+        best_value, best_move = None, names[0]
+        completed = 0
+        try:
+            for depth in range(1, self.max_depth + 1):
+                scores = []
+                exact = True
+                for move in mine:
+                    total = 0.0
+                    for dmg in self._damage(move, types_opp):
+                        child = (hp_me, hp_opp - dmg, mine, theirs, types_me, types_opp, False)
+                        value, searched = self._value(child, depth - 1)
+                        total += value
+                        exact &= searched >= EXACT
+                    scores.append(total / len(self.rolls))
+                # Ties, including positions already won or lost, go to the
+                # move with the most expected damage.
+                top = max(scores)
+                k = max((k for k in range(len(scores)) if scores[k] >= top - TIE),
+                        key=lambda k: sum(self._damage(mine[k], types_opp)))
+                best_value, best_move = scores[k], names[k]
+                completed = depth
+                if exact:
+                    break  # searched to the end of the battle
+        except _Timeout:
+            pass
+        elapsed = time.perf_counter() - start
+        self.stats = {"depth": completed, "nodes": self.nodes, "seconds": elapsed,
+                      "cache": len(self.cache)}
+        return best_value, best_move
+
+    def __call__(self, me, opponent):
+        # Drop-in move chooser for petbattle.enemy_turn.
+        return self.evaluate(me, opponent)[1]
+
+def greedy(me, opponent):
+    # petbattle's original enemy choice: the most effective move.
+    return max(me.moves, key=lambda name: petbattle.effectiveness_against(me.moves[name], opponent))
+
+def duel(a, b, choose_a, choose_b, rng):
+    # Headless battle(): returns True if a wins.
+    turn = rng.random() < 0.5
+    while a.hp > 0 and b.hp > 0:
+        attacker, defender, choose = (a, b, choose_a) if turn else (b, a, choose_b)
+        move = attacker.moves[choose(attacker, defender)]
+        mult = petbattle.effectiveness_against(move, defender)
+        defender.hp = max(0, defender.hp - int(move["power"] * mult * rng.uniform(0.85, 1.15)))
+        turn = not turn
+    return a.hp > 0
+
+def random_pet(rng, name, level):
+    element1, element2 = rng.sample(ELEMENTS, 2)
+    return Pet(name, element1, element2, level)
+
+def main():
+    parser = argparse.ArgumentParser(description="Expectiminimax Pet Battle AI")
+    parser.add_argument("--battles", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--budget-ms", type=float, default=20)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--play", action="store_true", help="play a campaign against this AI")
+    args = parser.parse_args()
+
+    ai = ExpectiminimaxAI(args.depth, args.budget_ms)
+    if args.play:
+        petbattle.play_campaign(enemy_ai=ai)
+        return
+
+    rng = random.Random(args.seed)
+    wins = decisions = depths = 0
+    start = time.perf_counter()
+
+    def counted(me, opponent):
+        nonlocal decisions, depths
+        decisions += 1
+        move = ai(me, opponent)
+        depths += ai.stats["depth"]
+        return move
+
+    for _ in range(args.battles):
+        level = rng.randint(1, 3)
+        if duel(random_pet(rng, "AI", level), random_pet(rng, "Greedy", level), counted, greedy, rng):
+            wins += 1
+    elapsed = time.perf_counter() - start
+    print(f"Search AI won {wins / args.battles:.1%} of {args.battles:,} battles against the greedy AI")
+    print(f"{decisions:,} decisions, {decisions / elapsed:,.0f} decisions/s, "
+          f"mean search depth {depths / max(decisions, 1):.1f}")
+
+if __name__ == "__main__":
+    main()
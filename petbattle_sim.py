@@ -0,0 +1,102 @@
+# petbattle_sim.py
+import argparse
+import time
+
+import numpy as np
+
+from petbattle import ELEMENTS, dual_array
+
+NUM_BATTLES = 5
+POWER = 12
+XP_PER_WIN = 50
+XP_PER_LEVEL = 100
+HEAL_FRACTION = 0.3
+
+def max_hp(level):
+    return 100 + (level - 1) * 10
+
+def simulate_campaigns(count, seed=None, num_battles=NUM_BATTLES):
+    # play_campaign for count campaigns at once. Both sides pick their most
+    # effective move (the player side stands in for the human), and every
+    # step of a battle is one attack by whoever is to move.
+    rng = np.random.default_rng(seed)
+    dual = dual_array()
+    n = len(ELEMENTS)
+
+    # Two different elements per player pet, like random.sample(ELEMENTS, 2).
+    type1 = rng.integers(n, size=count)
+    type2 = (type1 + rng.integers(1, n, size=count)) % n
+    level = np.ones(count, dtype=np.int64)
+    hp = np.full(count, max_hp(1))
+    xp = np.zeros(count, dtype=np.int64)
+    alive = np.ones(count, dtype=bool)
+    survival = [1.0]
+    turns = []
+
+    for _ in range(num_battles):
+        idx = np.flatnonzero(alive)
+        enemy = rng.integers(n, size=idx.size)
+        enemy_level = rng.integers(np.maximum(1, level[idx] - 1), level[idx] + 2)
+        enemy_hp = max_hp(enemy_level)
+        # The enemy has one element; the player side takes its better move.
+        player_mult = np.maximum(dual[type1[idx], enemy, enemy], dual[type2[idx], enemy, enemy])
+        enemy_mult = dual[enemy, type1[idx], type2[idx]]
+        player_hp = hp[idx]
+        player_turn = rng.random(idx.size) < 0.5
+        active = np.arange(idx.size)
+        steps = 0
+        while active.size:
+            steps += 1
+            mover = player_turn[active]
+            mult = np.where(mover, player_mult[active], enemy_mult[active])
+            dmg = (POWER * mult * rng.uniform(0.85, 1.15, active.size)).astype(np.int64)
+            hit_enemy = active[mover]
+            hit_player = active[~mover]
+            enemy_hp[hit_enemy] = np.maximum(0, enemy_hp[hit_enemy] - dmg[mover])
+            player_hp[hit_player] = np.maximum(0, player_hp[hit_player] - dmg[~mover])
+            player_turn[active] = ~mover
+            active = active[(enemy_hp[active] > 0) & (player_hp[active] > 0)]
+        turns.append(steps)
+
+        won = player_hp > 0
+        hp[idx] = player_hp
+        alive[idx[~won]] = False
+        winners = idx[won]
+        xp[winners] += XP_PER_WIN
+        up = winners[xp[winners] >= XP_PER_LEVEL]
+        level[up] += 1
+        xp[up] -= XP_PER_LEVEL
+        hp[up] = max_hp(level[up])  # level_up restores full HP
+        top = max_hp(level[winners])
+        hp[winners] = np.minimum(top, hp[winners] + (top * HEAL_FRACTION).astype(np.int64))
+        survival.append(float(alive.mean()))
+
+    return {
+        "campaigns": count,
+        "survival": survival,
+        "levels": np.bincount(level),
+        "completed_levels": np.bincount(level[alive], minlength=len(np.bincount(level))),
+        "longest_battles": turns,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Pet Battle campaigns")
+    parser.add_argument("--campaigns", type=int, default=1_000_000)
+    parser.add_argument("--battles", type=int, default=NUM_BATTLES)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = simulate_campaigns(args.campaigns, args.seed, args.battles)
+    elapsed = time.perf_counter() - start
+    print(f"{args.campaigns:,} campaigns in {elapsed:.2f}s ({args.campaigns / elapsed:,.0f} campaigns/s)")
+    print("Survival after each battle:")
+    for battle, alive in enumerate(stats["survival"]):
+        print(f"  {battle}: {alive:7.2%}")
+    print("Final level (all campaigns / completed campaigns):")
+    for lvl, total in enumerate(stats["levels"]):
+        if total:
+            print(f"  level {lvl}: {total / args.campaigns:7.2%}  {stats['completed_levels'][lvl] / args.campaigns:7.2%}")
+
+if __name__ == "__main__":
+    main()
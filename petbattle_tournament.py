@@ -0,0 +1,222 @@
+# petbattle_tournament.py
+import argparse
+import itertools
+import os
+import random
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from petbattle import ELEMENTS, Pet
+from petbattle_ai import ExpectiminimaxAI, duel, greedy
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "petbattle_tournament.txt")
+ELO_START = 1500.0
+ELO_K = 16.0
+
+# Policies are made per match from the match's own RNG, so a match played
+# again after a resume gives the same result.
+def greedy_policy(rng):
+    return greedy
+
+def random_policy(rng):
+    return lambda me, opponent: rng.choice(list(me.moves))
+
+def search_policy(rng):
+    # No time limit, so a replayed match searches exactly as deep; each
+    # search starts from an empty cache.
+    return ExpectiminimaxAI(depth=4, budget_ms=float("inf"))
+
+POLICIES = {"greedy": greedy_policy, "random": random_policy, "search": search_policy}
+
+def make_roster(levels=(1, 2, 3), policies=("greedy", "random")):
+    # Every typing (single or dual) at every level with every policy.
+    roster = []
+    for (e1, e2), level, policy in itertools.product(
+            itertools.combinations_with_replacement(ELEMENTS, 2), levels, policies):
+        roster.append((e1, e2, level, policy))
+    return roster
+
+def entry_name(entry):
+    e1, e2, level, policy = entry
+    typing = e1 if e1 == e2 else f"{e1}/{e2}"
+    return f"{typing} L{level} {policy}"
+
+def play_match(a, b, entry_a, entry_b, games, seed, round_):
+    # Wins for a out of games headless battles; the seed depends only on the
+    # pairing, so a replayed match gives the same result.
+    rng = random.Random(f"{seed}:{round_}:{a}:{b}")
+    policy_a = POLICIES[entry_a[3]](rng)
+    policy_b = POLICIES[entry_b[3]](rng)
+    wins = 0
+    for _ in range(games):
+        pet_a = Pet("A", entry_a[0], entry_a[1], entry_a[2])
+        pet_b = Pet("B", entry_b[0], entry_b[1], entry_b[2])
+        wins += duel(pet_a, pet_b, policy_a, policy_b, rng)
+    return wins
+
+class Tournament:
+    # Ratings and standings rebuilt from, and appended to, a results file
+    # with one "round a b wins" line per finished match.
+    def __init__(self, roster, games=10, seed=0, path=RESULTS_PATH, fmt="swiss"):
+        self.roster = roster
+        self.games = games
+        self.seed = seed
+        self.path = path
+        self.format = fmt
+        self.header = (f"# petbattle {fmt} seed={seed} games={games} "
+                       f"roster={len(roster)}:{zlib.crc32(repr(roster).encode()):08x}")
+        self.ratings = [ELO_START] * len(roster)
+        self.scores = [0.0] * len(roster)
+        self.played = set()
+        self.rounds = 0
+        self.pending = []
+        lines = self._read_lines()
+        if lines:
+            if lines[0] != self.header:
+                raise ValueError(f"{path} belongs to another tournament: {lines[0]}")
+            records = [self._parse(line) for line in lines[1:]]
+            last = records[-1][0] if records else None
+            for round_, group in itertools.groupby(records, key=lambda r: r[0]):
+                group = list(group)
+                if fmt == "swiss" and round_ == last:
+                    # The last round may have been cut short: pair it again
+                    # from the standings before it and keep what is left.
+                    done = {(a, b) for _, a, b, _ in group}
+                    self.pending = [p for p in self.swiss_pairs() if p not in done]
+                for record in group:
+                    self._record(*record)
+        else:
+            # A new or empty file, or one killed before its header was done.
+            with open(path, "w") as f:
+                f.write(self.header + "\n")
+
+    @staticmethod
+    def _parse(line):
+        fields = line.split()
+        if len(fields) != 4 or not all(field.isdigit() for field in fields):
+            return None
+        return tuple(map(int, fields))
+
+    def _read_lines(self):
+        # The file up to its last complete record. A run killed mid-write
+        # can leave a partial last line; it is cut off the file, so new
+        # records follow the last good one.
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            data = f.read()
+        keep = data[:data.rfind(b"\n") + 1]
+        lines = keep.decode().splitlines()
+        if len(lines) > 1 and self._parse(lines[-1]) is None:
+            keep = keep[:keep.rstrip(b"\n").rfind(b"\n") + 1]
+            lines.pop()
+        for number, line in enumerate(lines[1:], 2):
+            if self._parse(line) is None:
+                raise ValueError(f"{self.path}:{number}: bad record {line!r}")
+        if len(keep) < len(data):
+            os.truncate(self.path, len(keep))
+        return lines
+
+    def _record(self, round_, a, b, wins):
+        self.played.add((min(a, b), max(a, b)))
+        self.rounds = max(self.rounds, round_ + 1)
+        score = wins / self.games
+        self.scores[a] += score
+        self.scores[b] += 1 - score
+        # Elo, one update per match for all of its games.
+        expected = 1 / (1 + 10 ** ((self.ratings[b] - self.ratings[a]) / 400))
+        delta = ELO_K * self.games * (score - expected)
+        self.ratings[a] += delta
+        self.ratings[b] -= delta
+
+    def _play(self, pairs, round_, pool):
+        pairs = [(a, b) for a, b in pairs if (min(a, b), max(a, b)) not in self.played]
+        if not pairs:
+            return 0
+        args = ([a for a, _ in pairs], [b for _, b in pairs],
+                [self.roster[a] for a, _ in pairs], [self.roster[b] for _, b in pairs],
+                [self.games] * len(pairs), [self.seed] * len(pairs), [round_] * len(pairs))
+        results = pool.map(play_match, *args, chunksize=16) if pool else map(play_match, *args)
+        with open(self.path, "a") as f:
+            for (a, b), wins in zip(pairs, results):
+                # Written as soon as it is known, so an interrupted run resumes here.
+                f.write(f"{round_} {a} {b} {wins}\n")
+                f.flush()
+                self._record(round_, a, b, wins)
+        return len(pairs)
+
+    def round_robin(self, pool=None):
+        return self._play(itertools.combinations(range(len(self.roster)), 2), 0, pool)
+
+    def swiss_pairs(self):
+        # Pair neighbours in the standings, skipping rematches; an odd one
+        # out sits the round out.
+        order = sorted(range(len(self.roster)), key=lambda i: (-self.scores[i], -self.ratings[i], i))
+        pairs = []
+        while len(order) > 1:
+            a = order.pop(0)
+            for k, b in enumerate(order):
+                if (min(a, b), max(a, b)) not in self.played:
+                    pairs.append((a, b))
+                    order.pop(k)
+                    break
+        return pairs
+
+    def swiss(self, rounds, pool=None):
+        # Rounds already in the file are not played again.
+        played = self._play(self.pending, self.rounds - 1, pool) if self.pending else 0
+        self.pending = []
+        while self.rounds < rounds:
+            round_ = self.rounds
+            played += self._play(self.swiss_pairs(), round_, pool)
+            self.rounds = round_ + 1
+        return played
+
+    def standings(self):
+        return sorted(range(len(self.roster)), key=lambda i: -self.ratings[i])
+
+    def group_ratings(self, key):
+        groups = {}
+        for entry, rating in zip(self.roster, self.ratings):
+            groups.setdefault(key(entry), []).append(rating)
+        return sorted(((sum(r) / len(r), name) for name, r in groups.items()), reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Pet Battle tournaments with Elo ratings")
+    parser.add_argument("format", choices=["swiss", "round-robin"], nargs="?", default="swiss")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--policies", choices=sorted(POLICIES), nargs="+", default=["greedy", "random"])
+    parser.add_argument("--rounds", type=int, default=7, help="Swiss rounds")
+    parser.add_argument("--games", type=int, default=10, help="battles per match")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results", default=RESULTS_PATH)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    roster = make_roster(args.levels, args.policies)
+    tournament = Tournament(roster, args.games, args.seed, args.results, args.format)
+    resumed = len(tournament.played)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        if args.format == "swiss":
+            played = tournament.swiss(args.rounds, pool)
+        else:
+            played = tournament.round_robin(pool)
+    elapsed = time.perf_counter() - start
+    print(f"{len(roster)} pets, {played} matches played in {elapsed:.2f}s"
+          + (f", {resumed} resumed from {args.results}" if resumed else ""))
+
+    print(f"\nTop {args.top}:")
+    for rank, i in enumerate(tournament.standings()[:args.top], 1):
+        print(f"{rank:>3}. {entry_name(roster[i]):<28} {tournament.ratings[i]:7.1f}  score {tournament.scores[i]:.1f}")
+    print("\nMean rating by typing:")
+    for rating, name in tournament.group_ratings(lambda e: e[0] if e[0] == e[1] else f"{e[0]}/{e[1]}"):
+        print(f"  {name:<14} {rating:7.1f}")
+    print("Mean rating by policy:")
+    for rating, name in tournament.group_ratings(lambda e: e[3]):
+        print(f"  {name:<14} {rating:7.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,101 @@
 # rps.py
 import random
+from array import array
 
 CHOICES = ["rock", "paper", "scissors"]
+MAX_ORDER = 4  # rounds of history the longest context looks back
+DECAY = 0.98  # older observations fade, so the bot follows a changing player
 
-def play_round():
+TIE, PLAYER_WINS, COMPUTER_WINS = range(3)
+# RESULT[player][computer] with moves as indexes into CHOICES.
+RESULT = [[(player - computer) % 3 for computer in range(3)] for player in range(3)]
+
+def outcome(player, computer):
+    return RESULT[player][computer]
+
+class MarkovBot:
+    # Predicts the player's next move from the last 0..MAX_ORDER rounds,
+    # each round being (player move, outcome), and plays the counter-move.
+    # Every order keeps decayed move counts per context in a fixed array,
+    # and its prediction is weighted by how well it has been doing lately.
+    # A round touches one row per order, so cost does not grow with history.
+    def __init__(self, max_order=MAX_ORDER, decay=DECAY, rng=random):
+        self.orders = range(max_order + 1)
+        self.decay = decay
+        self.rng = rng
+        self.counts = [array("d", [0.0]) * (3 * 9 ** k) for k in self.orders]
+        self.contexts = [0] * len(self.orders)  # base-9 code of the last k rounds
+        self.scores = array("d", [1.0]) * len(self.orders)
+        self.rounds = 0
+
+    def _predictions(self):
+        for k in self.orders:
+            if k <= self.rounds:
+                row = 3 * self.contexts[k]
+                counts = self.counts[k][row:row + 3]
+                total = sum(counts)
+                if total:
+                    yield k, [c / total for c in counts]
+
+    def predict(self):
+        # Mixed probability of the player's next move over CHOICES.
+        mixed = [0.0, 0.0, 0.0]
+        weight = 0.0
+        for k, probs in self._predictions():
+            for move in range(3):
+                mixed[move] += self.scores[k] * probs[move]
+            weight += self.scores[k]
+        return [p / weight for p in mixed] if weight else [1 / 3] * 3
+
+    def choose(self):
+        probs = self.predict()
+        # Expected score of each reply: beating the move minus losing to it.
+        values = [probs[(c - 1) % 3] - probs[(c + 1) % 3] for c in range(3)]
+        best = max(values)
+        return self.rng.choice([c for c in range(3) if values[c] == best])
+
+    def update(self, player, computer):
+        for k, probs in self._predictions():
+            # Orders that gave the real move a high chance gain weight.
+            self.scores[k] = self.decay * self.scores[k] + probs[player]
+        symbol = 3 * player + outcome(player, computer)
+        for k in self.orders:
+            row = 3 * self.contexts[k]
+            counts = self.counts[k]
+            for move in range(3):
+                counts[row + move] *= self.decay
+            counts[row + player] += 1.0
+            if k:
+                self.contexts[k] = (self.contexts[k] * 9 + symbol) % 9 ** k
+        self.rounds += 1
+
+def play_round(opponent=None):
     player = input("Choose Rock, Paper, or Scissors: ").lower().strip()
     if player not in CHOICES:
         print("❌ Invalid choice. Try again.")
         return None
 
-    computer = random.choice(CHOICES)
+    if opponent:
+        computer = CHOICES[opponent.choose()]
+        opponent.update(CHOICES.index(player), CHOICES.index(computer))
+    else:
+        computer = random.choice(CHOICES)
     print(f"🖥️ Computer chose: {computer.capitalize()}")
 
-    if player == computer:
+    result = RESULT[CHOICES.index(player)][CHOICES.index(computer)]
+    if result == TIE:
         print("🤝 It's a tie!")
-    elif (player == "rock" and computer == "scissors") or \
-         (player == "scissors" and computer == "paper") or \
-         (player == "paper" and computer == "rock"):
+    elif result == PLAYER_WINS:
         print("🎉 You win!")
     else:
         print("💀 You lose.")
+    return result
 
 def main():
     print("Welcome to Rock, Paper, Scissors!")
+    opponent = MarkovBot()
     while True:
-        play_round()
+        play_round(opponent)
         again = input("Play again? [y/n]: ").lower().strip()
         if again != "y":
             print("Thanks for playing!")
@@ -0,0 +1,172 @@
+# rps_arena.py
+import argparse
+import itertools
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from rps import COMPUTER_WINS, PLAYER_WINS, RESULT, MarkovBot
+
+BLOCK = 1 << 16  # rounds per batch of moves
+Z95 = 1.96
+
+# PAYOFF[a][b]: +1 if move a beats move b, -1 if it loses, 0 for a tie.
+PAYOFF = np.array([[1 if r == PLAYER_WINS else -1 if r == COMPUTER_WINS else 0 for r in row]
+                   for row in RESULT], dtype=np.int8)
+
+# A bot has choose() -> move index into CHOICES and update(opponent, own)
+# after every round, like rps.MarkovBot. Bots whose moves never depend on
+# the game so far also have moves(n), an array of their next n moves, and
+# the arena plays those rounds without a Python loop.
+class UniformBot:
+    def __init__(self, rng):
+        self.rng = rng
+
+    def moves(self, n):
+        return self.rng.integers(3, size=n, dtype=np.int8)
+
+class BiasedBot:
+    # Leans towards rock, like many people do.
+    def __init__(self, rng, probs=(0.5, 0.3, 0.2)):
+        self.rng = rng
+        self.probs = probs
+
+    def moves(self, n):
+        return self.rng.choice(3, size=n, p=self.probs).astype(np.int8)
+
+class RockBot:
+    def __init__(self, rng):
+        pass
+
+    def moves(self, n):
+        return np.zeros(n, dtype=np.int8)
+
+class CycleBot:
+    # Rock, paper, scissors, rock, ...
+    def __init__(self, rng):
+        self.next = 0
+
+    def moves(self, n):
+        moves = (self.next + np.arange(n)) % 3
+        self.next = (self.next + n) % 3
+        return moves.astype(np.int8)
+
+class BeatLastBot:
+    # Plays what would have beaten the opponent's last move.
+    def __init__(self, rng):
+        self.last = int(rng.integers(3))
+
+    def choose(self):
+        return (self.last + 1) % 3
+
+    def update(self, opponent, own):
+        self.last = opponent
+
+class FrequencyBot:
+    # Counters the opponent's most common move so far.
+    def __init__(self, rng):
+        self.counts = [0, 0, 0]
+
+    def choose(self):
+        counts = self.counts
+        return (counts.index(max(counts)) + 1) % 3
+
+    def update(self, opponent, own):
+        self.counts[opponent] += 1
+
+def markov_bot(rng):
+    return MarkovBot(rng=random.Random(int(rng.integers(1 << 63))))
+
+BOTS = {
+    "uniform": UniformBot, "biased": BiasedBot, "rock": RockBot, "cycle": CycleBot,
+    "beat-last": BeatLastBot, "frequency": FrequencyBot, "markov": markov_bot,
+}
+
+def _play_block(a, b, n):
+    # Moves of a and b for n rounds, asking bots without moves() round by round.
+    batch_a = a.moves(n) if hasattr(a, "moves") else None
+    batch_b = b.moves(n) if hasattr(b, "moves") else None
+    if batch_a is not None and batch_b is not None:
+        return batch_a, batch_b
+    listed_a = batch_a.tolist() if batch_a is not None else None
+    listed_b = batch_b.tolist() if batch_b is not None else None
+    moves_a, moves_b = [0] * n, [0] * n
+    for i in range(n):
+        x = listed_a[i] if listed_a else a.choose()
+        y = listed_b[i] if listed_b else b.choose()
+        if not listed_a:
+            a.update(y, x)
+        if not listed_b:
+            b.update(x, y)
+        moves_a[i] = x
+        moves_b[i] = y
+    return np.array(moves_a, dtype=np.int8), np.array(moves_b, dtype=np.int8)
+
+def play_match(name_a, name_b, rounds, seed):
+    # (wins, losses) for name_a over rounds against name_b.
+    rng = np.random.default_rng(seed)
+    a, b = BOTS[name_a](rng), BOTS[name_b](rng)
+    wins = losses = 0
+    for start in range(0, rounds, BLOCK):
+        moves_a, moves_b = _play_block(a, b, min(BLOCK, rounds - start))
+        scores = PAYOFF[moves_a, moves_b]
+        wins += int(np.count_nonzero(scores == 1))
+        losses += int(np.count_nonzero(scores == -1))
+    return wins, losses
+
+def arena(names, rounds, seed=None, pool=None):
+    # Mean payoff per round and its 95% interval for every pair of bots,
+    # each bot also playing a copy of itself. Seeds come from one
+    # SeedSequence, so a run is repeatable whatever the number of workers.
+    if rounds < 2:
+        raise ValueError("an interval needs at least 2 rounds per matchup")
+    pairs = list(itertools.combinations_with_replacement(range(len(names)), 2))
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+    args = ([names[i] for i, _ in pairs], [names[j] for _, j in pairs],
+            [rounds] * len(pairs), seeds)
+    results = pool.map(play_match, *args) if pool else map(play_match, *args)
+    payoff = np.zeros((len(names), len(names)))
+    margin = np.zeros((len(names), len(names)))
+    for (i, j), (wins, losses) in zip(pairs, results):
+        mean = (wins - losses) / rounds
+        var = (wins + losses) / rounds - mean ** 2
+        payoff[j, i] = 0.0 - mean  # written first, so self-play keeps its own mean
+        payoff[i, j] = mean
+        margin[i, j] = margin[j, i] = Z95 * math.sqrt(var / (rounds - 1))
+    return payoff, margin
+
+def main():
+    parser = argparse.ArgumentParser(description="Rock, Paper, Scissors bot arena")
+    parser.add_argument("--bots", nargs="+", choices=sorted(BOTS), default=list(BOTS))
+    parser.add_argument("--rounds", type=int, default=100_000, help="rounds per matchup")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+    if args.rounds < 2:
+        parser.error("--rounds must be at least 2")
+
+    names = args.bots
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        payoff, margin = arena(names, args.rounds, args.seed, pool)
+    elapsed = time.perf_counter() - start
+    matches = len(names) * (len(names) + 1) // 2
+    total = matches * args.rounds
+    print(f"{matches} matchups of {args.rounds:,} rounds in {elapsed:.2f}s "
+          f"({total / elapsed:,.0f} rounds/s)")
+
+    print("\nMean payoff per round for the row bot (±95% interval):")
+    width = 16
+    print(" " * 10 + "".join(f"{name:>{width}}" for name in names))
+    for i, name in enumerate(names):
+        cells = "".join(f"{f'{payoff[i, j]:+.3f}±{margin[i, j]:.3f}':>{width}}" for j in range(len(names)))
+        print(f"{name:<10}{cells}")
+    print("\nAverage payoff against the field:")
+    for i in sorted(range(len(names)), key=lambda i: -payoff[i].mean()):
+        print(f"  {names[i]:<10} {payoff[i].mean():+.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# test_battleship.py
+import random
+
+import pytest
+
+from battleship import Board, _pack, place_ships
+
+@pytest.mark.parametrize("board_size, first, second", [
+    (2, [1, 1, 1], [1, 1, 1]),
+    (3, [3, 3], [3, 2]),
+])
+def test_fleet_that_no_longer_fits_is_rejected(board_size, first, second):
+    board = Board(board_size)
+    place_ships(board, first, random.Random(0))
+    with pytest.raises(ValueError, match="does not fit"):
+        place_ships(board, second, random.Random(0))
+
+def test_fleet_that_fills_the_rest_of_the_board():
+    board = Board(3)
+    place_ships(board, [3, 3], random.Random(0))
+    place_ships(board, [3], random.Random(0))
+    assert board.occupied == (1 << 9) - 1
+
+def test_pack_on_a_full_board_fails():
+    assert _pack(2, ((1, 1),), 0b1111, 0, None, set(), [100]) is None
@@ -0,0 +1,24 @@
+# test_dungeondice_raid.py
+import numpy as np
+
+from dungeondice import Player
+from dungeondice_raid import HEROES, MONSTERS, Encounter
+
+def test_boss_attacks_stay_within_the_die():
+    # Monster.attack: a boss keeps the better of two rolls and never crits.
+    encounter = Encounter(seed=0)
+    bosses = encounter.add(MONSTERS, 10_000, 50, attack_die=8, is_boss=True)
+    rolls = encounter._attacks(bosses)
+    assert rolls.min() >= 1
+    assert rolls.max() <= 8
+    # max of two d8 rolls: 8 comes up 15/64 of the time.
+    assert abs(np.mean(rolls == 8) - 15 / 64) < 0.02
+
+def test_hero_attacks_still_crit():
+    encounter = Encounter(seed=0)
+    hero = Player("", "Warrior")
+    heroes = encounter.add(HEROES, 10_000, hero.max_hp, hero.attack_die, hero.defense_die,
+                           hero_class="Warrior")
+    encounter.special_used[heroes] = True
+    rolls = encounter._attacks(heroes)
+    assert rolls.max() == 2 * hero.attack_die
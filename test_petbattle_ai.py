@@ -0,0 +1,38 @@
+# test_petbattle_ai.py
+import random
+
+from petbattle import Pet
+from petbattle_ai import ExpectiminimaxAI, random_pet
+
+def pets(hp_me, hp_opp):
+    me = Pet("Me", "Grass", "Fire", 3)
+    opponent = Pet("Opponent", "Grass", "Water", 3)
+    me.hp, opponent.hp = hp_me, hp_opp
+    return me, opponent
+
+def dominated(ai, me, opponent, move):
+    # Another move does at least as much damage on every roll, and more on some.
+    rolls = {name: ai._damage((m["power"], m["type_id"]), opponent.type_ids)
+             for name, m in me.moves.items()}
+    return any(other != rolls[move] and all(x >= y for x, y in zip(other, rolls[move]))
+               for other in rolls.values())
+
+def test_fixed_position_picks_the_effective_move():
+    # Grass does 1.5x against Grass/Water, Fire only 0.75x.
+    for depth in range(1, 7):
+        assert ExpectiminimaxAI(depth, budget_ms=1e9)(*pets(120, 96)) == "Grass Attack"
+
+def test_reused_ai_picks_the_effective_move():
+    ai = ExpectiminimaxAI(depth=6, budget_ms=1e9)
+    for hp in range(20, 121, 10):
+        ai(*pets(hp, hp))
+    assert ai(*pets(120, 96)) == "Grass Attack"
+
+def test_never_picks_a_dominated_move():
+    rng = random.Random(5)
+    ai = ExpectiminimaxAI()
+    for _ in range(200):
+        level = rng.randint(1, 3)
+        me, opponent = random_pet(rng, "Me", level), random_pet(rng, "Opponent", level)
+        me.hp, opponent.hp = rng.randint(1, me.max_hp), rng.randint(1, opponent.max_hp)
+        assert not dominated(ai, me, opponent, ai(me, opponent))
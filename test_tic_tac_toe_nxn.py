@@ -0,0 +1,19 @@
+# test_tic_tac_toe_nxn.py
+import time
+
+import pytest
+
+from tic_tac_toe_nxn import AnytimeSearch, Board
+
+@pytest.mark.parametrize("budget_ms", [50, 200])
+def test_budgeted_move_returns_in_time(budget_ms):
+    board = Board(15, 5)
+    for cell, player in [(112, 1), (113, 2), (97, 1), (127, 2)]:
+        board.play(cell, player)
+    search = AnytimeSearch()
+    start = time.perf_counter()
+    cell = search.choose(board, 1, budget_ms)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert board.cells[cell] == 0
+    assert len(board.moves) == 4
+    assert elapsed_ms <= budget_ms + 15
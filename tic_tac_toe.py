@@ -68,7 +68,91 @@ def best_move(board, human, computer):
             move = (r, c)
     return move
 
-def play_game():
+# Bitboard engine: each player's marks are an int with bit r * 3 + c set
+# for cell (r, c). Search is negamax with alpha-beta, and positions are
+# cached as (side to move, opponent) so the table is reused across games.
+FULL = 0b111111111
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+]
+EXACT, LOWER, UPPER = range(3)
+
+def has_won(bits):
+    return any(bits & mask == mask for mask in WIN_MASKS)
+
+def to_bitboard(board, player):
+    return sum(1 << (r * 3 + c) for r in range(3) for c in range(3) if board[r][c] == player)
+
+class Engine:
+    def __init__(self):
+        self.table = {}
+        self.nodes = 0
+        self.last_nodes = 0
+        self.table_hits = 0
+
+    def search(self, me, opp, alpha, beta):
+        # Value for the side to move: 1 win, 0 draw, -1 loss.
+        self.nodes += 1
+        if has_won(opp):
+            return -1
+        if me | opp == FULL:
+            return 0
+
+        key = (me, opp)
+        entry = self.table.get(key)
+        if entry:
+            value, flag = entry
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                self.table_hits += 1
+                return value
+
+        start_alpha = alpha
+        best = -math.inf
+        free = FULL & ~(me | opp)
+        while free:
+            bit = free & -free
+            free ^= bit
+            score = -self.search(opp, me | bit, -beta, -alpha)
+            if score > best:
+                best = score
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+
+        if best <= start_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (best, flag)
+        return best
+
+    def best_move(self, board, human, computer):
+        # Same cell order and tie-breaking as best_move: the first move with
+        # the highest score wins, so a later move only needs to beat it.
+        start = self.nodes
+        me = to_bitboard(board, computer)
+        opp = to_bitboard(board, human)
+        best_score = -math.inf
+        move = None
+        for (r, c) in get_empty_cells(board):
+            if best_score == 1:
+                break
+            score = -self.search(opp, me | 1 << (r * 3 + c), -math.inf, -best_score)
+            if score > best_score:
+                best_score = score
+                move = (r, c)
+        self.last_nodes = self.nodes - start
+        return move
+
+ENGINE = Engine()
+
+def play_game(choose_move=None):
+    choose_move = choose_move or ENGINE.best_move
     board = [[" "] * 3 for _ in range(3)]
     human = "X"
     computer = "O"
@@ -109,7 +193,7 @@ def play_game():
 
         # Computer turn
         print("Computer's turn...")
-        r, c = best_move(board, human, computer)
+        r, c = choose_move(board, human, computer)
         board[r][c] = computer
 
         if check_winner(board, computer):
@@ -122,9 +206,9 @@ def play_game():
             print("🤝 It's a tie!")
             break
 
-def main():
+def main(choose_move=None):
     while True:
-        play_game()
+        play_game(choose_move)
         again = input("Play again? (y/n): ").lower().strip()
         if again != "y":
             print("Thanks for playing Tic Tac Toe!")
@@ -0,0 +1,119 @@
+# tic_tac_toe_batch.py
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+import tic_tac_toe
+from tic_tac_toe_table import LINES, POWERS, SYMMETRIES
+
+# Boards use the same encoding as tic_tac_toe_table: 0 empty, 1 side to
+# move, 2 opponent, either as an (N, 9) array of cells or (N,) base-3 codes.
+SYM = np.array(SYMMETRIES, dtype=np.intp)
+LINE_CELLS = np.array(LINES, dtype=np.intp)
+POWERS_ARRAY = np.array(POWERS, dtype=np.int64)
+# SYM_POWERS[i, s] is the place value of cell i once symmetry s is applied,
+# so one (N, 9) @ (9, 8) float matmul (exact below 3 ** 9) gives all codes.
+SYM_POWERS = np.array([[3.0 ** list(perm).index(i) for perm in SYMMETRIES] for i in range(9)])
+CACHE_SIZE = 4096
+
+_engine = tic_tac_toe.Engine()
+
+def decode(codes):
+    codes = np.asarray(codes, dtype=np.int64)
+    return (codes[:, None] // POWERS_ARRAY) % 3
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _evaluate(code):
+    # (value, move) for one canonical, non-terminal position.
+    cells = [code // p % 3 for p in POWERS]
+    me = sum(1 << i for i, v in enumerate(cells) if v == 1)
+    opp = sum(1 << i for i, v in enumerate(cells) if v == 2)
+    value, move = -2, -1
+    for i in range(9):
+        if cells[i] or value == 1:
+            continue
+        score = -_engine.search(opp, me | 1 << i, -2, -value)
+        if score > value:
+            value, move = score, i
+    return value, move
+
+def cache_info():
+    return _evaluate.cache_info()
+
+def evaluate_batch(boards):
+    # Returns (values, moves) for the side to move: values are 1/0/-1 and
+    # moves are cell indices r * 3 + c, or -1 when the game is already over.
+    boards = np.asarray(boards)
+    if boards.ndim == 1:
+        boards = decode(boards)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError("boards must be (N, 9) cells or (N,) codes")
+
+    # Canonical code of every board under the 8 symmetries, then unique.
+    codes = (boards.astype(np.float64) @ SYM_POWERS).astype(np.int64)
+    sym_index = codes.argmin(axis=1)
+    canonical_codes = codes[np.arange(len(boards)), sym_index]
+    unique_codes, first, inverse = np.unique(canonical_codes, return_index=True, return_inverse=True)
+    unique_boards = np.take_along_axis(boards[first], SYM[sym_index[first]], axis=1)
+
+    # Winner and full-board checks for the whole batch at once.
+    lines = unique_boards[:, LINE_CELLS]
+    mover_won = (lines == 1).all(axis=2).any(axis=1)
+    opponent_won = (lines == 2).all(axis=2).any(axis=1)
+    full = (unique_boards != 0).all(axis=1)
+    counts = (unique_boards == 1).sum(axis=1) - (unique_boards == 2).sum(axis=1)
+    illegal = mover_won | ~np.isin(counts, (0, -1))
+    if illegal.any():
+        raise ValueError(f"{int(illegal.sum())} boards are not legal positions")
+
+    values = np.zeros(len(unique_codes), dtype=np.int8)
+    moves = np.full(len(unique_codes), -1, dtype=np.int8)
+    values[opponent_won] = -1
+    for k in np.flatnonzero(~opponent_won & ~full):
+        values[k], moves[k] = _evaluate(int(unique_codes[k]))
+
+    # Back from canonical cells to each board's own orientation.
+    values = values[inverse]
+    moves = moves[inverse]
+    has_move = moves >= 0
+    moves[has_move] = SYM[sym_index[has_move], moves[has_move]]
+    return values, moves
+
+def random_positions(rng, count):
+    # Random legal positions from random play, for benchmarking.
+    boards = np.zeros((count, 9), dtype=np.int8)
+    plies = rng.integers(0, 9, size=count)
+    for ply in range(9):
+        rows = np.flatnonzero((plies > ply) & ~_finished(boards))
+        if not rows.size:
+            break
+        keys = rng.random((rows.size, 9)) + (boards[rows] != 0)
+        cells = keys.argmin(axis=1)
+        # Place for the side to move, then swap roles for the next ply.
+        boards[rows, cells] = 1
+        boards[rows] = np.where(boards[rows] == 0, 0, 3 - boards[rows])
+    return boards
+
+def _finished(boards):
+    lines = boards[:, LINE_CELLS]
+    return (lines == 2).all(axis=2).any(axis=1) | (boards != 0).all(axis=1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch Tic Tac Toe position evaluation")
+    parser.add_argument("--boards", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    boards = random_positions(np.random.default_rng(args.seed), args.boards)
+    start = time.perf_counter()
+    values, _ = evaluate_batch(boards)
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {len(boards):,} boards in {elapsed:.2f}s ({len(boards) / elapsed:,.0f} boards/s)")
+    print(f"Wins {np.mean(values == 1):.1%}, draws {np.mean(values == 0):.1%}, "
+          f"losses {np.mean(values == -1):.1%} for the side to move")
+    print(f"Cache: {cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+# tic_tac_toe_nxn.py
+import argparse
+import math
+import time
+
+EMPTY = 0
+MARKS = ".XO"
+WIN_SCORE = 10 ** 9
+BRANCH_LIMIT = 12  # candidate moves searched per node, best-looking first
+POLL_MASK = 63  # the clock is read every POLL_MASK + 1 nodes
+
+class Board:
+    # N x N board with a k-in-a-row goal. Cells are indexed r * size + c.
+    # Every run of k cells is a "window"; per-window stone counts give both
+    # win detection (only windows through the last move can complete) and
+    # an evaluation that is updated in place as moves are made and undone.
+    def __init__(self, size=7, win_length=4):
+        if not 1 <= win_length <= size:
+            raise ValueError("win length must be between 1 and the board size")
+        self.size = size
+        self.win_length = win_length
+        self.cells = [EMPTY] * (size * size)
+        self.moves = []
+        self.windows = []
+        self.cell_windows = [[] for _ in self.cells]
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r = r + dr * (win_length - 1)
+                    end_c = c + dc * (win_length - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        window = [(r + dr * i) * size + c + dc * i for i in range(win_length)]
+                        for cell in window:
+                            self.cell_windows[cell].append(len(self.windows))
+                        self.windows.append(window)
+        self.counts = [None, [0] * len(self.windows), [0] * len(self.windows)]
+        self.weights = [0] + [4 ** i for i in range(1, win_length + 1)]
+        self.score = 0  # from player 1's point of view
+        self.near = [0] * len(self.cells)
+        self.neighbors = [
+            [nr * size + nc
+             for nr in range(max(0, r - 1), min(size, r + 2))
+             for nc in range(max(0, c - 1), min(size, c + 2))
+             if (nr, nc) != (r, c)]
+            for r in range(size) for c in range(size)
+        ]
+
+    def _value(self, w):
+        a = self.counts[1][w]
+        b = self.counts[2][w]
+        if a and not b:
+            return self.weights[a]
+        if b and not a:
+            return -self.weights[b]
+        return 0
+
+    def play(self, cell, player):
+        # Returns True if this move completes k in a row.
+        won = False
+        mine = self.counts[player]
+        for w in self.cell_windows[cell]:
+            before = self._value(w)
+            mine[w] += 1
+            if mine[w] == self.win_length:
+                won = True
+            self.score += self._value(w) - before
+        self.cells[cell] = player
+        self.moves.append(cell)
+        for n in self.neighbors[cell]:
+            self.near[n] += 1
+        return won
+
+    def undo(self):
+        cell = self.moves.pop()
+        mine = self.counts[self.cells[cell]]
+        for w in self.cell_windows[cell]:
+            before = self._value(w)
+            mine[w] -= 1
+            self.score += self._value(w) - before
+        self.cells[cell] = EMPTY
+        for n in self.neighbors[cell]:
+            self.near[n] -= 1
+
+    def gain(self, cell, player):
+        # How much a move here helps `player`: growing their own open
+        # windows or blocking the opponent's.
+        mine = self.counts[player]
+        theirs = self.counts[3 - player]
+        total = 0
+        for w in self.cell_windows[cell]:
+            a = mine[w]
+            b = theirs[w]
+            if not b:
+                total += self.weights[a + 1] - self.weights[a]
+            elif not a:
+                total += self.weights[b]
+        return total
+
+    def is_full(self):
+        return len(self.moves) == len(self.cells)
+
+    def candidates(self):
+        if not self.moves:
+            return [len(self.cells) // 2]
+        return [i for i, cell in enumerate(self.cells) if cell == EMPTY and self.near[i]]
+
+    def show(self):
+        width = len(str(self.size - 1))
+        print(" " * (width + 1) + " ".join(f"{c % 10}" for c in range(self.size)))
+        for r in range(self.size):
+            row = self.cells[r * self.size:(r + 1) * self.size]
+            print(f"{r:>{width}} " + " ".join(MARKS[cell] for cell in row))
+
+class _Timeout(Exception):
+    pass
+
+class AnytimeSearch:
+    # Iterative-deepening negamax with alpha-beta. Each finished depth
+    # replaces the answer, so whatever is known when the budget runs out
+    # is returned.
+    def __init__(self):
+        self.nodes = 0
+        self.deadline = 0.0
+        self.polled = 0.0
+        self.stats = {}
+
+    def _check_time(self):
+        # Stops one poll interval early, as the next poll would come too late.
+        now = time.perf_counter()
+        if now + (now - self.polled) > self.deadline:
+            raise _Timeout
+        self.polled = now
+
+    def _ordered(self, board, player, first=None):
+        moves = sorted(board.candidates(), key=lambda cell: board.gain(cell, player), reverse=True)
+        moves = moves[:BRANCH_LIMIT]
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _negamax(self, board, player, depth, alpha, beta):
+        self.nodes += 1
+        if self.nodes & POLL_MASK == 0:
+            self._check_time()
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return board.score if player == 1 else -board.score
+
+        best = -math.inf
+        for cell in self._ordered(board, player):
+            if board.play(cell, player):
+                board.undo()
+                return WIN_SCORE + depth  # sooner wins score higher
+            score = -self._negamax(board, 3 - player, depth - 1, -beta, -alpha)
+            board.undo()
+            if score > best:
+                best = score
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    break
+        return best
+
+    def _root(self, board, player, depth, first):
+        best_score = -math.inf
+        best_move = None
+        alpha = -math.inf
+        for cell in self._ordered(board, player, first):
+            self._check_time()
+            if board.play(cell, player):
+                board.undo()
+                return WIN_SCORE + depth, cell
+            score = -self._negamax(board, 3 - player, depth - 1, -math.inf, -alpha)
+            board.undo()
+            if score > best_score:
+                best_score = score
+                best_move = cell
+                alpha = max(alpha, score)
+        return best_score, best_move
+
+    def choose(self, board, player, budget_ms=1000):
+        start = time.perf_counter()
+        self.deadline = start + budget_ms / 1000
+        self.polled = start
+        self.nodes = 0
+        played = len(board.moves)
+        best_move = self._ordered(board, player)[0]
+        best_score = 0
+        completed = 0
+        remaining = len(board.cells) - len(board.moves)
+        try:
+            for depth in range(1, remaining + 1):
+                best_score, best_move = self._root(board, player, depth, best_move)
+                completed = depth
+                if abs(best_score) >= WIN_SCORE:
+                    break  # forced result, deeper search cannot change it
+        except _Timeout:
+            # Unwind the moves the interrupted search left on the board.
+            while len(board.moves) > played:
+                board.undo()
+        elapsed = time.perf_counter() - start
+        self.stats = {
+            "depth": completed,
+            "nodes": self.nodes,
+            "ms": elapsed * 1000,
+            "nodes_per_second": self.nodes / elapsed if elapsed else 0.0,
+            "score": best_score,
+        }
+        return best_move
+
+def play_game(size, win_length, budget_ms):
+    board = Board(size, win_length)
+    search = AnytimeSearch()
+    human, computer = 1, 2
+    print(f"🎮 {size}x{size} Tic Tac Toe, {win_length} in a row wins. You are X.")
+
+    while True:
+        board.show()
+        try:
+            row = int(input(f"Enter row (0-{size - 1}): "))
+            col = int(input(f"Enter col (0-{size - 1}): "))
+        except ValueError:
+            print("❌ Please enter valid numbers.")
+            continue
+        if not (0 <= row < size and 0 <= col < size):
+            print("❌ Out of bounds, try again.")
+            continue
+        cell = row * size + col
+        if board.cells[cell] != EMPTY:
+            print("⚠️ That spot is already taken.")
+            continue
+
+        if board.play(cell, human):
+            board.show()
+            print("🎉 You win!")
+            break
+        if board.is_full():
+            board.show()
+            print("🤝 It's a tie!")
+            break
+
+        print("Computer's turn...")
+        cell = search.choose(board, computer, budget_ms)
+        stats = search.stats
+        print(f"Searched depth {stats['depth']}, {stats['nodes']:,} nodes "
+              f"in {stats['ms']:.0f} ms ({stats['nodes_per_second']:,.0f} nodes/s)")
+        if board.play(cell, computer):
+            board.show()
+            print("💻 Computer wins!")
+            break
+        if board.is_full():
+            board.show()
+            print("🤝 It's a tie!")
+            break
+
+def main():
+    parser = argparse.ArgumentParser(description="N x N k-in-a-row Tic Tac Toe")
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--win", type=int, default=4, help="stones in a row needed to win")
+    parser.add_argument("--budget", type=int, default=1000, help="computer thinking time in ms")
+    args = parser.parse_args()
+    while True:
+        play_game(args.size, args.win, args.budget)
+        again = input("Play again? (y/n): ").lower().strip()
+        if again != "y":
+            print("Thanks for playing!")
+            break
+
+if __name__ == "__main__":
+    main()
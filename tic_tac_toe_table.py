@@ -0,0 +1,133 @@
+# tic_tac_toe_table.py
+import argparse
+import mmap
+import os
+
+import tic_tac_toe
+
+# Positions are stored from the point of view of the side to move: each
+# cell is 0 (empty), 1 (side to move) or 2 (opponent), and the position
+# code is sum(cell * 3 ** index) with index = r * 3 + c.
+MAGIC = b"TTT1"
+NUM_CODES = 3 ** 9
+NO_MOVE = 15
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tic_tac_toe.table")
+
+# The 8 board symmetries as index permutations: new[i] = old[perm[i]].
+_ROTATE = [6, 3, 0, 7, 4, 1, 8, 5, 2]
+_MIRROR = [2, 1, 0, 5, 4, 3, 8, 7, 6]
+
+def _compose(a, b):
+    return [a[i] for i in b]
+
+def _symmetries():
+    perms = []
+    perm = list(range(9))
+    for _ in range(4):
+        perms.append(perm)
+        perms.append(_compose(perm, _MIRROR))
+        perm = _compose(perm, _ROTATE)
+    return perms
+
+SYMMETRIES = _symmetries()
+POWERS = [3 ** i for i in range(9)]
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+def encode(cells):
+    return sum(v * p for v, p in zip(cells, POWERS))
+
+def canonical(cells):
+    # Smallest code over all symmetries, plus the permutation that made it.
+    best = None
+    for perm in SYMMETRIES:
+        code = encode([cells[i] for i in perm])
+        if best is None or code < best[0]:
+            best = (code, perm)
+    return best
+
+def _has_line(cells, player):
+    return any(cells[a] == cells[b] == cells[c] == player for a, b, c in LINES)
+
+def _solve(cells, solved):
+    # Negamax over canonical positions; stores (value, move) per code with
+    # the move in the canonical position's own cell numbering.
+    code, perm = canonical(cells)
+    if code in solved:
+        return solved[code][0]
+    cells = [cells[i] for i in perm]
+    if _has_line(cells, 2):
+        value, move = -1, None
+    elif 0 not in cells:
+        value, move = 0, None
+    else:
+        value, move = -2, None
+        for i in range(9):
+            if cells[i]:
+                continue
+            # After the move the opponent is to move, so swap 1 and 2.
+            child = [(3 - v) if v else 0 for v in cells]
+            child[i] = 2
+            score = -_solve(child, solved)
+            if score > value:
+                value, move = score, i
+    solved[code] = (value, move)
+    return value
+
+def build(path=TABLE_PATH):
+    solved = {}
+    _solve([0] * 9, solved)
+    table = bytearray(NUM_CODES)
+    for code, (value, move) in solved.items():
+        # bit 7: entry present, bits 4-5: value + 1, bits 0-3: move.
+        table[code] = 0x80 | (value + 1) << 4 | (NO_MOVE if move is None else move)
+    with open(path, "wb") as f:
+        f.write(MAGIC + table)
+    return len(solved)
+
+class PerfectTable:
+    # Read-only view of the built table. The file is memory-mapped, so every
+    # process and every game shares the same pages.
+    def __init__(self, path=TABLE_PATH):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC or len(self.data) != len(MAGIC) + NUM_CODES:
+            raise ValueError(f"{path} is not a tic tac toe table")
+
+    @classmethod
+    def open(cls, path=TABLE_PATH):
+        if not os.path.exists(path):
+            build(path)
+        return cls(path)
+
+    def lookup(self, cells):
+        # (value, cell) for the side to move; cell is None if the game is over.
+        code, perm = canonical(cells)
+        entry = self.data[len(MAGIC) + code]
+        if not entry & 0x80:
+            raise ValueError("position cannot arise in a legal game")
+        move = entry & 0x0F
+        return ((entry >> 4) & 0x3) - 1, None if move == NO_MOVE else perm[move]
+
+    def best_move(self, board, human, computer):
+        # Drop-in for tic_tac_toe.best_move.
+        cells = [1 if s == computer else 2 if s == human else 0 for row in board for s in row]
+        _, move = self.lookup(cells)
+        return None if move is None else divmod(move, 3)
+
+    def close(self):
+        self.data.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfect-play Tic Tac Toe table")
+    parser.add_argument("mode", choices=["build", "play"], nargs="?", default="play")
+    parser.add_argument("--path", default=TABLE_PATH)
+    args = parser.parse_args()
+    if args.mode == "build":
+        count = build(args.path)
+        print(f"Wrote {count} canonical positions to {args.path}")
+        return
+    table = PerfectTable.open(args.path)
+    tic_tac_toe.main(table.best_move)
+
+if __name__ == "__main__":
+    main()